@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from asyncio import timeout as asyncio_timeout
 from typing import Any
 
 from .connection import Connection
@@ -9,6 +11,7 @@ from .const import (
     AlarmState,
     ArmedStatus,
     ArmLevel,
+    ArmResult,
     ArmUpState,
     ChimeMode,
     Max,
@@ -18,6 +21,9 @@ from .elements import Element, Elements
 from .message import al_encode, as_encode, az_encode, dm_encode, zb_encode
 from .notify import Notifier
 
+ARM_TIMEOUT = 10.0
+FORCE_ARM_LEVELS = {ArmLevel.FORCE_ARM_TO_AWAY_MODE, ArmLevel.FORCE_ARM_TO_STAY_MODE}
+
 
 class Area(Element):
     """Class representing an Area"""
@@ -33,6 +39,8 @@ class Area(Element):
         self.timer2 = 0
         self.last_log: str | None = None
         self.chime_mode = None
+        # Area of each keypad, shared by all areas and kept up to date by Areas
+        self._keypad_areas: list[int] = []
 
     def is_armed(self) -> bool:
         """Return if the area is armed."""
@@ -55,10 +63,63 @@ class Area(Element):
             return
         self._connection.send(al_encode(level, self._index, code))
 
+    async def arm_async(
+        self, level: ArmLevel, code: int, timeout: float = ARM_TIMEOUT
+    ) -> ArmResult:
+        """(Helper) Arm system at level and wait for the panel to report it.
+
+        Completes when AS or EE shows the new armed status, when the area
+        reports it is not ready to arm, or when a keypad in this area reports
+        an invalid code. Keypad areas come from the KA report requested while
+        syncing; until it arrives, invalid codes end in a timeout.
+        """
+        # Force arming bypasses open zones so is never reported as not ready
+        check_ready = level not in FORCE_ARM_LEVELS | {ArmLevel.DISARM}
+        if level != ArmLevel.DISARM and self.is_armed():
+            return ArmResult.ALREADY_ARMED
+        if check_ready and self.arm_up_state == ArmUpState.NOT_READY_TO_ARM:
+            return ArmResult.NOT_READY
+
+        result: asyncio.Future[ArmResult] = asyncio.get_running_loop().create_future()
+
+        def status_changed(area: Element, changeset: dict[str, Any]) -> None:
+            if result.done():
+                return
+            if _arm_level_reached(level, self.armed_status):
+                result.set_result(ArmResult.SUCCESS)
+            elif check_ready and self.arm_up_state == ArmUpState.NOT_READY_TO_ARM:
+                result.set_result(ArmResult.NOT_READY)
+
+        def code_checked(code: str, user: int, keypad: int) -> None:
+            # User number 000 is sent when the code is invalid
+            if user >= 0 or result.done():
+                return
+            areas = self._keypad_areas
+            if 0 <= keypad < len(areas) and areas[keypad] == self._index:
+                result.set_result(ArmResult.INVALID_CODE)
+
+        self.add_callback(status_changed, ("armed_status", "arm_up_state"))
+        self._notifier.attach("IC", code_checked)
+        self._connection.send(al_encode(level, self._index, code))
+        if level == ArmLevel.DISARM and self.armed_status == ArmedStatus.DISARMED:
+            status_changed(self, {})
+        try:
+            async with asyncio_timeout(timeout):
+                return await result
+        except TimeoutError:
+            return ArmResult.TIMEOUT
+        finally:
+            self.remove_callback(status_changed)
+            self._notifier.detach("IC", code_checked)
+
     def disarm(self, code: int) -> None:
         """(Helper) Disarm system."""
         self.arm(ArmLevel.DISARM, code)
 
+    async def disarm_async(self, code: int, timeout: float = ARM_TIMEOUT) -> ArmResult:
+        """(Helper) Disarm system and wait for the panel to report it."""
+        return await self.arm_async(ArmLevel.DISARM, code, timeout)
+
     def display_message(
         self, clear: int, beep: bool, timeout: int, line1: str, line2: str
     ) -> None:
@@ -76,25 +137,48 @@ class Area(Element):
         self._connection.send(zb_encode(-1, self._index, code))
 
 
+def _arm_level_reached(level: ArmLevel, armed_status: ArmedStatus | None) -> bool:
+    if level == ArmLevel.DISARM:
+        return armed_status == ArmedStatus.DISARMED
+    if armed_status in (None, ArmedStatus.DISARMED):
+        return False
+    # Arm to next mode and force arm levels do not name a single armed status
+    try:
+        return armed_status == ArmedStatus(level.value)
+    except ValueError:
+        return True
+
+
 class Areas(Elements[Area]):
     """Handling for multiple areas"""
 
+    indexed_attrs = ("armed_status", "alarm_state")
+
     def __init__(self, connection: Connection, notifier: Notifier) -> None:
         super().__init__(connection, notifier, Area, Max.AREAS.value)
         notifier.attach("AM", self._am_handler)
         notifier.attach("AS", self._as_handler)
         notifier.attach("EE", self._ee_handler)
+        notifier.attach("KA", self._ka_handler)
         notifier.attach("KF", self._kf_handler)
         notifier.attach("LD", self._ld_handler)
+        self._keypad_areas: list[int] = []
 
-    def sync(self) -> None:
-        """Retrieve areas from ElkM1"""
+    def sync_state(self) -> None:
+        """Retrieve area arming status from ElkM1"""
         self._connection.send(as_encode())
+
+    def sync_config(self) -> None:
+        """Retrieve areas from ElkM1"""
         self.get_descriptions(TextDescriptions.AREA.value)
 
+    def _materialize(self, index: int) -> Area:
+        area = super()._materialize(index)
+        area._keypad_areas = self._keypad_areas  # pylint: disable=protected-access
+        return area
+
     def _am_handler(self, alarm_memory: list[bool]) -> None:
-        for area in self.elements:
-            area.setattr("alarm_memory", alarm_memory[area.index], True)
+        self._update_columns({"alarm_memory": alarm_memory})
 
     def _as_handler(
         self,
@@ -102,16 +186,19 @@ class Areas(Elements[Area]):
         arm_up_states: list[ArmUpState],
         alarm_states: list[AlarmState],
     ) -> None:
-        update_alarm_triggers = False
-        for area in self.elements:
-            area.setattr("armed_status", armed_statuses[area.index], False)
-            area.setattr("arm_up_state", arm_up_states[area.index], False)
-            if (
-                area.alarm_state != alarm_states[area.index]
-                or alarm_states[area.index] != AlarmState.NO_ALARM_ACTIVE
-            ):
-                update_alarm_triggers = True
-            area.setattr("alarm_state", alarm_states[area.index], True)
+        update_alarm_triggers = any(
+            current != alarm_state or alarm_state != AlarmState.NO_ALARM_ACTIVE
+            for current, alarm_state in zip(
+                self.column("alarm_state"), alarm_states, strict=False
+            )
+        )
+        self._update_columns(
+            {
+                "armed_status": armed_statuses,
+                "arm_up_state": arm_up_states,
+                "alarm_state": alarm_states,
+            }
+        )
 
         if update_alarm_triggers:
             self._connection.send(az_encode())
@@ -124,7 +211,8 @@ class Areas(Elements[Area]):
         timer2: int,
         armed_status: ArmedStatus,
     ) -> None:
-        area_element = self.elements[area]
+        if not (area_element := self._get(area)):
+            return
         area_element.setattr("armed_status", armed_status, False)
         area_element.setattr("timer1", timer1, False)
         area_element.setattr("timer2", timer2, False)
@@ -135,12 +223,17 @@ class Areas(Elements[Area]):
         if log["event"] in [1173, 1174]:
             # arm/disarm log (YAGNI - decode number for more log types when needed)
             log["user_number"] = log["number"]
-        self.elements[area].setattr("last_log", log, True)
+        if area_element := self._get(area):
+            area_element.setattr("last_log", log, True)
+
+    def _ka_handler(self, keypad_areas: list[int]) -> None:
+        self._keypad_areas[:] = keypad_areas
 
     def _kf_handler(self, keypad: int, key: str, chime_mode: list[int]) -> None:
-        for area, mode in enumerate(chime_mode):
-            try:
-                name = ChimeMode(mode).name
-            except ValueError:
-                name = ""
-            self.elements[area].setattr("chime_mode", (name, mode), True)
+        with self._batch_changes():
+            for area, mode in enumerate(chime_mode[: self.max_elements]):
+                try:
+                    name = ChimeMode(mode).name
+                except ValueError:
+                    name = ""
+                self[area].setattr("chime_mode", (name, mode), True)
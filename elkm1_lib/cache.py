@@ -0,0 +1,64 @@
+"""On disk cache of panel text descriptions used to speed up startup."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import suppress
+from typing import Any
+
+LOG = logging.getLogger(__name__)
+
+Descriptions = dict[str, dict[int, str]]
+
+
+class DescriptionCache:
+    """Cache of SD descriptions, per element type, keyed by panel."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            with open(self._path, encoding="utf-8") as file:
+                contents = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            LOG.warning("Ignoring unreadable description cache %s: %s", self._path, exc)
+            return {}
+        return contents if isinstance(contents, dict) else {}
+
+    def load(self, panel: str) -> tuple[str | None, Descriptions]:
+        """Return the panel version and descriptions cached for the panel."""
+        entry = self._read().get(panel, {})
+        descriptions = {
+            element_type: {int(index): name for index, name in names.items()}
+            for element_type, names in entry.get("descriptions", {}).items()
+        }
+        return entry.get("version"), descriptions
+
+    def save(self, panel: str, version: str | None, descriptions: Descriptions) -> None:
+        """Store descriptions for the panel. Blocking; run in an executor."""
+        with self._lock:
+            contents = self._read()
+            contents[panel] = {"version": version, "descriptions": descriptions}
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(self._path) or ".",
+                    prefix=f"{os.path.basename(self._path)}.",
+                    suffix=".tmp",
+                )
+                with open(fd, "w", encoding="utf-8") as file:
+                    json.dump(contents, file)
+                os.replace(tmp_path, self._path)
+            except OSError as exc:
+                LOG.warning("Unable to write description cache %s: %s", self._path, exc)
+                if tmp_path:
+                    with suppress(OSError):
+                        os.unlink(tmp_path)
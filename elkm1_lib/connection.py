@@ -6,18 +6,29 @@ import asyncio
 import logging
 from asyncio import timeout as asyncio_timeout
 from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from functools import reduce
+from itertools import islice
 from typing import Any, NamedTuple
 
 from serial_asyncio_fast import open_serial_connection
 
-from .message import MessageEncode, decode, get_elk_command
+from .message import (
+    MessageEncode,
+    decode,
+    get_elk_command,
+    replace_key,
+    toggle_key,
+)
 from .notify import Notifier
+from .ratelimit import RateLimiter
 from .util import parse_url
 
 LOG = logging.getLogger(__name__)
 HEARTBEAT_TIME = 120
 MESSAGE_RESPONSE_TIME = 5.0
+BATCH_WAIT_TIME = 30.0
 
 
 class QueuedWrite(NamedTuple):
@@ -27,6 +38,9 @@ class QueuedWrite(NamedTuple):
     response_cmd: str | None
     timeout: float = 5.0
     raw: bool = False
+    done: asyncio.Future[bool] | None = None
+    priority: bool = False
+    key: str | None = None
 
 
 class Connection:
@@ -40,6 +54,8 @@ class Connection:
         self._awaiting_response_command: str | None = None
         self._paused = False
         self._write_queue: deque[QueuedWrite] = deque()
+        self._batches: dict[asyncio.Task[Any] | None, list[QueuedWrite]] = {}
+        self._rate_limiters: dict[str, RateLimiter] = {}
         self._check_write_queue = asyncio.Event()
         self._response_received = asyncio.Event()
         self._heartbeat_event = asyncio.Event()
@@ -101,6 +117,19 @@ class Connection:
                     LOG.error("Invalid message '%s'", data, exc_info=exc)
 
     async def _write_stream(self) -> None:
+        async def pace_msg() -> None:
+            limiter = self._rate_limiters.get(
+                "priority" if q_entry.priority else "normal"
+            )
+            if not limiter:
+                return
+            # Checksum and line end are added to all but raw messages
+            size = len(q_entry.msg) + (2 if q_entry.raw else 4)
+            delay = limiter.delay(size)
+            if delay:
+                await asyncio.sleep(delay)
+            limiter.consume(size, delay)
+
         async def write_msg() -> None:
             if not q_entry.raw:  # pylint: disable=possibly-used-before-assignment
                 cksum = (256 - reduce(lambda x, y: x + y, map(ord, q_entry.msg))) % 256
@@ -110,15 +139,18 @@ class Connection:
             LOG.debug("write_data '%s'", msg[:-2])
             self._writer.write((msg).encode())  # type: ignore
 
-        async def await_msg_response() -> None:
+        async def await_msg_response() -> bool:
             self._awaiting_response_command = q_entry.response_cmd
+            received = True
             try:
                 async with asyncio_timeout(MESSAGE_RESPONSE_TIME):
                     await self._response_received.wait()
             except TimeoutError:
+                received = False
                 self._notifier.notify("timeout", {"msg_code": q_entry.response_cmd})
             self._response_received.clear()
             self._awaiting_response_command = None
+            return received
 
         while True:
             if not self._write_queue:
@@ -128,31 +160,140 @@ class Connection:
             self._check_write_queue.clear()
             if self._write_queue:
                 q_entry = self._write_queue.popleft()
+                await pace_msg()
+                if not self._writer:
+                    break
                 await write_msg()
+                received = True
                 if q_entry.response_cmd:
-                    await await_msg_response()
+                    received = await await_msg_response()
+                if q_entry.done and not q_entry.done.done():
+                    q_entry.done.set_result(received)
 
     def _send(self, q_entry: QueuedWrite, priority_send: bool) -> None:
         if self._paused:
             return
+        if (
+            self._batches
+            and (batch := self._batches.get(asyncio.current_task())) is not None
+        ):
+            q_entry = q_entry._replace(priority=priority_send)
+            batch.append(_take_superseded(batch, q_entry, False))
+            return
+        q_entry = _take_superseded(self._write_queue, q_entry, priority_send)
         if priority_send:
-            self._write_queue.appendleft(q_entry)
+            self._write_queue.appendleft(q_entry._replace(priority=True))
         else:
             self._write_queue.append(q_entry)
         self._check_write_queue.set()
 
     def send(self, msg: MessageEncode, priority_send: bool = False) -> None:
         """Send a message to Elk."""
-        self._send(QueuedWrite(msg.message, msg.response_command), priority_send)
+        self._send(
+            QueuedWrite(
+                msg.message, msg.response_command, key=replace_key(msg.message)
+            ),
+            priority_send,
+        )
 
     def send_raw(self, msg: str) -> None:
         """Send a raw message to Elk (no checksum will be added)."""
         self._send(QueuedWrite(msg, None, raw=True), False)
 
+    @asynccontextmanager
+    async def batch(
+        self,
+        priority: bool = False,
+        wait: bool = False,
+        timeout: float = BATCH_WAIT_TIME,
+    ) -> AsyncIterator[None]:
+        """Collect the messages sent inside the block and queue them together.
+
+        Only messages sent by the task running the block are collected. A
+        newer write of the same setpoint, value or light level replaces an
+        older one; other messages are all sent. With priority the group goes
+        ahead of anything already queued, as do messages sent with
+        priority_send. With wait, leaving the block waits (up to timeout
+        seconds) until every message is written and its response, if any,
+        received. The collected messages are discarded if the block raises.
+        Nested batches join the outermost one.
+        """
+        task = asyncio.current_task()
+        if task is None or task in self._batches:
+            yield
+            return
+
+        self._batches[task] = []
+        try:
+            yield
+        finally:
+            entries = self._batches.pop(task)
+
+        if self._paused or not entries:
+            return
+        waits: list[asyncio.Future[bool]] = []
+        if wait:
+            loop = asyncio.get_running_loop()
+            waits = [loop.create_future() for _ in entries]
+            entries = [
+                entry._replace(done=done)
+                for entry, done in zip(entries, waits, strict=True)
+            ]
+        # Queued writes superseded by the batch are dropped
+        head = [
+            _take_superseded(self._write_queue, entry._replace(priority=True), True)
+            for entry in entries
+            if priority or entry.priority
+        ]
+        tail = [
+            _take_superseded(self._write_queue, entry, False)
+            for entry in entries
+            if not (priority or entry.priority)
+        ]
+        self._write_queue.extendleft(reversed(head))
+        self._write_queue.extend(tail)
+        self._check_write_queue.set()
+
+        if waits:
+            await asyncio.wait(waits, timeout=timeout)
+
+    def set_rate_limit(
+        self,
+        messages_per_second: float | None = None,
+        bytes_per_second: float | None = None,
+        priority: bool = False,
+    ) -> None:
+        """Limit how fast messages are written to the panel.
+
+        Priority sends have their own budget. No limits removes pacing.
+        """
+        priority_class = "priority" if priority else "normal"
+        if messages_per_second or bytes_per_second:
+            self._rate_limiters[priority_class] = RateLimiter(
+                messages_per_second, bytes_per_second
+            )
+        else:
+            self._rate_limiters.pop(priority_class, None)
+
+    def rate_limit_state(self) -> dict[str, dict[str, Any]]:
+        """Current rate limit budgets and totals by priority class."""
+        return {
+            priority_class: limiter.state()
+            for priority_class, limiter in self._rate_limiters.items()
+        }
+
     def is_connected(self) -> bool:
         """Is the connection active?"""
         return self._writer is not None
 
+    def is_paused(self) -> bool:
+        """Is sending paused (e.g. while ElkRP is connected)?"""
+        return self._paused
+
+    def is_idle(self) -> bool:
+        """Nothing queued to send and no response being waited on?"""
+        return not self._write_queue and self._awaiting_response_command is None
+
     def pause(self) -> None:
         """Pause the connection from sending/receiving."""
         self._write_queue.clear()
@@ -189,3 +330,43 @@ class Connection:
                 self.disconnect("(heartbeat timeout)")
                 await self.connect()
                 break
+
+
+def _superseded(queued: QueuedWrite, q_entry: QueuedWrite) -> QueuedWrite:
+    """Return q_entry, passing on its result to the queued entry's future."""
+    if not queued.done:
+        return q_entry
+    if not q_entry.done:
+        return q_entry._replace(done=queued.done)
+    superseded = queued.done
+
+    def finished(done: asyncio.Future[bool]) -> None:
+        if not superseded.done():
+            superseded.set_result(done.result())
+
+    q_entry.done.add_done_callback(finished)
+    return q_entry
+
+
+def _take_superseded(
+    queue: deque[QueuedWrite] | list[QueuedWrite], q_entry: QueuedWrite, at_head: bool
+) -> QueuedWrite:
+    """Remove the queued write that q_entry replaces, returning q_entry.
+
+    q_entry must then be added at the tail, after anything queued since the
+    write it replaces, or at the head when at_head. At the head it would
+    jump a queued toggle of the same target, so nothing is replaced then.
+    """
+    if not q_entry.key:
+        return q_entry
+    for position, queued in enumerate(queue):
+        if queued.key != q_entry.key:
+            continue
+        if at_head and any(
+            toggle_key(later.msg) == q_entry.key
+            for later in islice(queue, position + 1, None)
+        ):
+            return q_entry
+        del queue[position]
+        return _superseded(queued, q_entry)
+    return q_entry
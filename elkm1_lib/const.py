@@ -423,3 +423,20 @@ class ElkRPStatus(Enum):
     DISCONNECTED = 0
     CONNECTED = 1
     INITIALIZING = 2
+
+
+class ArmResult(Enum):
+    """Outcome of an Area.arm_async request."""
+
+    SUCCESS = 0
+    ALREADY_ARMED = 1
+    NOT_READY = 2
+    INVALID_CODE = 3
+    TIMEOUT = 4
+
+
+class Overflow(Enum):
+    """What an event stream does when its consumer falls behind."""
+
+    DROP_OLDEST = 0
+    COALESCE = 1
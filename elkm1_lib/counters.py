@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from .connection import Connection
+import asyncio
+import time
+from asyncio import timeout as asyncio_timeout
+
+from .connection import MESSAGE_RESPONSE_TIME, Connection
 from .const import Max, TextDescriptions
 from .elements import Element, Elements
 from .message import cv_encode, cx_encode
@@ -14,18 +18,52 @@ class Counter(Element):
 
     def __init__(self, index: int, connection: Connection, notifier: Notifier) -> None:
         super().__init__(index, connection, notifier)
-        self.value = None
+        self.value: int | None = None
+        self._value_time: float | None = None
+        self._pending: asyncio.Future[int] | None = None
 
     def get(self) -> None:
         """(Helper) Get counter"""
         self._connection.send(cv_encode(self._index))
 
+    async def get_async(
+        self, max_age: float = 0.0, timeout: float = MESSAGE_RESPONSE_TIME
+    ) -> int | None:
+        """(Helper) Get counter value, from the panel if older than max_age seconds.
+
+        Concurrent callers share one request to the panel. Raises TimeoutError
+        if the panel does not respond within timeout seconds.
+        """
+        if (
+            self._value_time is not None
+            and time.monotonic() - self._value_time <= max_age
+        ):
+            return self.value
+
+        pending = self._pending
+        if pending is None:
+            pending = asyncio.get_running_loop().create_future()
+            self._pending = pending
+            self._connection.send(cv_encode(self._index))
+        try:
+            async with asyncio_timeout(timeout):
+                return await asyncio.shield(pending)
+        except TimeoutError:
+            if self._pending is pending:
+                self._pending = None
+            raise
+
     def set(self, value: int) -> None:
         """(Helper) Set counter to value"""
         self._connection.send(cx_encode(self._index, value))
 
-    def _configured_was_set(self) -> None:
-        self._connection.send(cv_encode(self.index), priority_send=True)
+    def _value_received(self, value: int) -> None:
+        self._value_time = time.monotonic()
+        self.setattr("value", value, True)
+        if self._pending:
+            if not self._pending.done():
+                self._pending.set_result(value)
+            self._pending = None
 
 
 class Counters(Elements[Counter]):
@@ -33,11 +71,31 @@ class Counters(Elements[Counter]):
 
     def __init__(self, connection: Connection, notifier: Notifier) -> None:
         super().__init__(connection, notifier, Counter, Max.COUNTERS.value)
+        self._refreshed: set[int] | None = None
         notifier.attach("CV", self._cv_handler)
 
-    def sync(self) -> None:
+    def sync_config(self) -> None:
         """Retrieve values from ElkM1 on demand"""
+        self._refreshed = None
         self.get_descriptions(TextDescriptions.COUNTER.value)
 
+    def refresh(self) -> None:
+        """Retrieve the values of all configured counters."""
+        self._refreshed = set()
+        self._request_values(self._refreshed)
+
+    def _descriptions_retrieved(self) -> None:
+        # Descriptions loaded from the cache are refreshed after the values
+        # were requested; request them for any newly configured counters
+        if self._refreshed is not None:
+            self._request_values(self._refreshed)
+
+    def _request_values(self, requested: set[int]) -> None:
+        for counter in self._materialized():
+            if counter.configured and counter.index not in requested:
+                requested.add(counter.index)
+                self._connection.send(cv_encode(counter.index))
+
     def _cv_handler(self, counter: int, value: int) -> None:
-        self.elements[counter].setattr("value", value, True)
+        if element := self._get(counter):
+            element._value_received(value)  # pylint: disable=protected-access
@@ -4,16 +4,76 @@ Base of all the elements found on the Elk panel... Zone, Keypad, etc.
 
 from __future__ import annotations
 
+import asyncio
+import bisect
 import re
+import time
 from abc import abstractmethod
-from collections.abc import Callable, Generator
-from typing import Any, Generic, TypeVar
+from asyncio import timeout as asyncio_timeout
+from collections import deque
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Generator,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from contextlib import contextmanager
+from typing import Any, Generic, Self, TypeVar, overload
 
-from .connection import Connection
-from .const import TextDescription, TextDescriptions
+from .connection import MESSAGE_RESPONSE_TIME, Connection
+from .const import Overflow, TextDescription, TextDescriptions
+from .history import History
 from .message import sd_encode
 from .notify import Notifier
 
+ElementEvent = tuple[int, dict[str, Any]]
+
+
+class _EventQueue:
+    """Bounded queue of element changes for one events() subscriber."""
+
+    def __init__(self, maxsize: int, overflow: Overflow) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._events: deque[ElementEvent] = deque()
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, elements: Elements[Any], changes: dict[int, dict[str, Any]]) -> None:
+        """Collection callback; queue each element's changes."""
+        coalesce = self._overflow == Overflow.COALESCE
+        for index, changeset in changes.items():
+            if coalesce and index in self._pending:
+                self._pending[index].update(changeset)
+                continue
+            # Coalesced queues hold at most one event per element so never drop
+            if not coalesce and len(self._events) >= self._maxsize:
+                self._pop()
+                self.dropped += 1
+            event = (index, dict(changeset))
+            self._events.append(event)
+            if coalesce:
+                self._pending[index] = event[1]
+        self._ready.set()
+
+    def _pop(self) -> ElementEvent:
+        event = self._events.popleft()
+        self._pending.pop(event[0], None)
+        return event
+
+    async def get(self) -> ElementEvent:
+        """Wait for and return the oldest queued event."""
+        while not self._events:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._pop()
+
 
 class Element:
     """Element class"""
@@ -22,10 +82,13 @@ class Element:
         self._index = index
         self._connection = connection
         self._notifier = notifier
-        self._observers: list[Callable[[Element, dict[str, Any]], None]] = []
+        self._observers: list[
+            tuple[Callable[[Element, dict[str, Any]], None], frozenset[str] | None]
+        ] = []
         self.name: str = self.default_name()
         self._changeset: dict[str, Any] = {}
         self._configured: bool = False
+        self._history: History | None = None
 
     @property
     def index(self) -> int:
@@ -37,21 +100,43 @@ class Element:
         """If a callback has ever been triggered this will be true."""
         return self._configured
 
-    def add_callback(self, observer: Callable[[Element, dict[str, Any]], None]) -> None:
-        """Callbacks when attribute of element changes"""
-        self._observers.append(observer)
+    @property
+    def history(self) -> History | None:
+        """Recent attribute changes, if enabled with enable_history."""
+        return self._history
+
+    def enable_history(
+        self, size: int = 100, attrs: Iterable[str] | None = None
+    ) -> None:
+        """Keep the last size changes of attrs (all attributes if None)."""
+        self._history = History(size, attrs)
+
+    def add_callback(
+        self,
+        observer: Callable[[Element, dict[str, Any]], None],
+        attrs: Iterable[str] | None = None,
+    ) -> None:
+        """Callbacks when attribute of element changes.
+
+        If attrs is given the observer is only called when the changeset
+        includes at least one of those attributes.
+        """
+        self._observers.append((observer, frozenset(attrs) if attrs else None))
 
     def remove_callback(
         self, observer: Callable[[Element, dict[str, Any]], None]
     ) -> None:
         """Callbacks when attribute of element changes"""
-        if observer in self._observers:
-            self._observers.remove(observer)
+        self._observers = [entry for entry in self._observers if entry[0] != observer]
 
     def _notify(self) -> None:
         """Callbacks when attribute of element changes"""
-        for observer in self._observers:
-            observer(self, self._changeset)
+        changeset = self._changeset
+        if self._history is not None:
+            self._history.record(changeset)
+        for observer, attrs in self._observers:
+            if attrs is None or not attrs.isdisjoint(changeset):
+                observer(self, changeset)
         self._changeset = {}
 
     def setattr(
@@ -66,6 +151,43 @@ class Element:
         if close_the_changeset and self._changeset:
             self._notify()
 
+    def wait_for(
+        self,
+        check: Callable[[Self], bool],
+        attrs: Iterable[str] | None = None,
+        timeout: float = MESSAGE_RESPONSE_TIME,
+    ) -> Coroutine[Any, Any, bool]:
+        """Wait until check(element) is true, testing after each change to attrs.
+
+        Watching starts on the call, so changes received before the result is
+        awaited are seen. The awaitable returns False on timeout.
+        """
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+
+        def changed(element: Element, changeset: dict[str, Any]) -> None:
+            if not future.done() and check(self):
+                future.set_result(True)
+
+        if check(self):
+            future.set_result(True)
+        else:
+            self.add_callback(changed, attrs)
+        return self._wait(future, changed, timeout)
+
+    async def _wait(
+        self,
+        future: asyncio.Future[bool],
+        observer: Callable[[Element, dict[str, Any]], None],
+        timeout: float,
+    ) -> bool:
+        try:
+            async with asyncio_timeout(timeout):
+                return await future
+        except TimeoutError:
+            return False
+        finally:
+            self.remove_callback(observer)
+
     def default_name(self, separator: str = "-") -> str:
         """Return a default name for based on class and index of element"""
         return f"{self.__class__.__name__}{separator}{self._index + 1:03}"
@@ -102,6 +224,9 @@ T = TypeVar("T", bound=Element)
 class Elements(Generic[T]):
     """Base for list of elements."""
 
+    # Attributes to keep a value -> element indexes lookup for, see select()
+    indexed_attrs: tuple[str, ...] = ()
+
     def __init__(
         self,
         connection: Connection,
@@ -112,40 +237,394 @@ class Elements(Generic[T]):
         self._connection = connection
         self._notifier = notifier
         self.max_elements = max_elements
-        self.elements = [class_(i, connection, notifier) for i in range(max_elements)]
+        self._class = class_
+        # Elements are created on first use; the prototype holds the values
+        # every element starts with, so reports can be compared against it
+        # without creating elements that are still in their initial state.
+        self._elements: list[T | None] = [None] * max_elements
+        self._uncreated = set(range(max_elements))
+        self._prototype = class_(0, connection, notifier)
+        self._history_config: tuple[int, frozenset[str] | None] | None = None
+        self._observers: list[
+            Callable[[Elements[T], dict[int, dict[str, Any]]], None]
+        ] = []
+        self._batch: dict[int, dict[str, Any]] | None = None
+        self._indexes: dict[str, dict[Any, set[int]]] = {
+            attr: {} for attr in self.indexed_attrs
+        }
+        self._indexed_values: dict[str, dict[int, Any]] = {
+            attr: {} for attr in self.indexed_attrs
+        }
 
         self._text_desc: TextDescription | None = None
+        self._desc_priority = True
+        self._desc_loaded: set[int] = set()
+        self._desc_seen: set[int] = set()
+        self._active: list[int] | None = None
+        self._desc_started = 0.0
+        self._desc_round_trips = 0
         notifier.attach("SD", self._sd_handler)
 
-    def __iter__(self) -> Generator[Element, None, None]:
-        yield from self.elements
+    def __iter__(self) -> Generator[T, None, None]:
+        for index in range(self.max_elements):
+            yield self[index]
+
+    @overload
+    def __getitem__(self, key: int) -> T: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> list[T]: ...
+
+    def __getitem__(self, key: int | slice) -> T | list[T]:
+        if isinstance(key, slice):
+            return [self[index] for index in range(self.max_elements)[key]]
+        element = self._elements[key]
+        if element is None:
+            element = self._materialize(key)
+        return element
+
+    def _get(self, index: int) -> T | None:
+        """Element for an index from the panel; None if not being tracked."""
+        return self[index] if 0 <= index < self.max_elements else None
+
+    def limit(self, max_elements: int) -> None:
+        """Only track the first max_elements elements, e.g. zones 1 to 48.
+
+        Limits the description retrieval as well as the elements created.
+        Call before connecting.
+        """
+        self.max_elements = max(0, min(max_elements, self.max_elements))
+        for index in range(self.max_elements, len(self._elements)):
+            if element := self._elements[index]:
+                for attr in self.indexed_attrs:
+                    self._index_remove(attr, index)
+                element.remove_callback(self._element_changed)
+        self._uncreated.difference_update(range(self.max_elements, len(self._elements)))
+        del self._elements[self.max_elements :]
+
+    def auto_size(self) -> None:
+        """Limit status report processing to the configured elements.
+
+        After this, bulk status reports only update elements that are
+        configured (see _is_active) when auto_size was called, or that become
+        configured afterwards.
+        """
+        self._active = [
+            element.index
+            for element in self._materialized()
+            if self._is_active(element)
+        ]
+
+    def _is_active(self, element: T) -> bool:
+        return element.configured
+
+    def _activate(self, index: int) -> None:
+        if self._active is not None and index not in self._active:
+            bisect.insort(self._active, index)
+
+    @property
+    def elements(self) -> list[T]:
+        """All of the elements (creates any that have not been used yet)."""
+        return list(self)
+
+    def _materialize(self, index: int) -> T:
+        index = range(self.max_elements)[index]
+        element = self._class(index, self._connection, self._notifier)
+        element.add_callback(self._element_changed)
+        if self._history_config is not None:
+            element.enable_history(*self._history_config)
+        self._elements[index] = element
+        self._uncreated.discard(index)
+        for attr in self.indexed_attrs:
+            self._index(attr, index, getattr(element, attr))
+        return element
+
+    def enable_history(
+        self, size: int = 100, attrs: Iterable[str] | None = None
+    ) -> None:
+        """Keep the last size changes of attrs (all if None) for every element."""
+        if size < 1:
+            raise ValueError(f"History size must be at least 1, got {size}")
+        self._history_config = (size, frozenset(attrs) if attrs is not None else None)
+        for element in self._materialized():
+            element.enable_history(size, attrs)
+
+    def _materialized(self) -> Generator[T, None, None]:
+        """Elements that have been created; the rest are in initial state."""
+        for element in self._elements:
+            if element is not None:
+                yield element
 
-    def __getitem__(self, key: int) -> Element:
-        return self.elements[key]
+    def add_callback(
+        self, observer: Callable[[Elements[T], dict[int, dict[str, Any]]], None]
+    ) -> None:
+        """Callbacks when elements change; one call per message received.
+
+        The observer gets a dict of element index to that element's changeset.
+        """
+        self._observers.append(observer)
+
+    def remove_callback(
+        self, observer: Callable[[Elements[T], dict[int, dict[str, Any]]], None]
+    ) -> None:
+        """Remove a callback added with add_callback."""
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+    async def events(
+        self, maxsize: int = 100, overflow: Overflow = Overflow.DROP_OLDEST
+    ) -> AsyncIterator[ElementEvent]:
+        """Iterate over (index, changeset) for element changes as received.
+
+        Changes are held in a queue per iterator, so a slow consumer never
+        holds up message processing. With Overflow.DROP_OLDEST the queue holds
+        up to maxsize events and the oldest is dropped when it is full. With
+        Overflow.COALESCE changes to an element already queued are merged into
+        its pending event, so the queue holds at most one event per element
+        and none are dropped; maxsize does not apply.
+        Subscribing starts with the first iteration.
+        """
+        queue = _EventQueue(maxsize, overflow)
+        self.add_callback(queue.put)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.remove_callback(queue.put)
+
+    def _element_changed(self, element: Element, changeset: dict[str, Any]) -> None:
+        for attr in self.indexed_attrs:
+            if attr in changeset:
+                self._index(attr, element.index, changeset[attr])
+        if self._batch is not None:
+            self._batch.setdefault(element.index, {}).update(changeset)
+        elif self._observers:
+            self._notify({element.index: dict(changeset)})
+
+    def _notify(self, changes: dict[int, dict[str, Any]]) -> None:
+        for observer in list(self._observers):
+            observer(self, changes)
+
+    def _index(self, attr: str, index: int, value: Any) -> None:
+        values = self._indexed_values[attr]
+        if index in values:
+            if values[index] == value:
+                return
+            self._index_remove(attr, index)
+        values[index] = value
+        self._indexes[attr].setdefault(value, set()).add(index)
+
+    def _index_remove(self, attr: str, index: int) -> None:
+        lookup = self._indexes[attr]
+        old_value = self._indexed_values[attr].pop(index)
+        lookup[old_value].discard(index)
+        if not lookup[old_value]:
+            del lookup[old_value]
+
+    @contextmanager
+    def _batch_changes(self) -> Iterator[None]:
+        """Collect element changes and notify collection observers once."""
+        if self._batch is not None:
+            yield
+            return
+        self._batch = {}
+        try:
+            yield
+        finally:
+            changes, self._batch = self._batch, None
+            if changes and self._observers:
+                self._notify(changes)
+
+    def column(self, attr: str) -> list[Any]:
+        """Return the value of attr for every element, in index order."""
+        default = getattr(self._prototype, attr)
+        return [
+            default if element is None else getattr(element, attr)
+            for element in self._elements
+        ]
+
+    def select(self, **criteria: Any) -> list[T]:
+        """Return the elements whose attributes equal all of the criteria.
+
+        Matching elements that have not been used yet are created; use
+        select_indexes to look up without creating any.
+        """
+        return [self[index] for index in self.select_indexes(**criteria)]
+
+    def select_indexes(self, **criteria: Any) -> list[int]:
+        """Return the indexes of elements whose attributes equal all criteria.
+
+        Criteria on indexed_attrs are looked up directly; others are scanned.
+        Elements not yet created are only looked at through the prototype.
+        """
+
+        def matches(element: T) -> bool:
+            return all(getattr(element, attr) == val for attr, val in criteria.items())
+
+        lookups = [
+            self._indexes[attr].get(value, set())
+            for attr, value in criteria.items()
+            if attr in self._indexes
+        ]
+        created: Iterable[T | None]
+        if lookups:
+            created = (self._elements[index] for index in set.intersection(*lookups))
+        else:
+            created = self._materialized()
+        found = {
+            element.index
+            for element in created
+            if element is not None and matches(element)
+        }
+        # Elements not yet created all have the prototype's values
+        if matches(self._prototype):
+            found |= self._uncreated
+        return sorted(found)
+
+    def _update_columns(
+        self,
+        columns: dict[str, Sequence[Any]],
+        offset: int = 0,
+        active_only: bool = False,
+    ) -> None:
+        """Bulk update from a report; one column of values per attribute.
+
+        Only elements where at least one attribute changed are notified. If
+        active_only and the collection has been auto sized, only the active
+        elements are looked at.
+        """
+        attrs = list(columns)
+        defaults = tuple(getattr(self._prototype, attr) for attr in attrs)
+        rows: Iterable[tuple[int, tuple[Any, ...]]]
+        if active_only and self._active is not None:
+            end = offset + min(len(column) for column in columns.values())
+            rows = (
+                (index, tuple(column[index - offset] for column in columns.values()))
+                for index in self._active
+                if offset <= index < end
+            )
+        else:
+            rows = enumerate(zip(*columns.values(), strict=True), offset)
+        with self._batch_changes():
+            for index, row in rows:
+                if index >= self.max_elements:
+                    break
+                element = self._elements[index]
+                if element is None:
+                    if row == defaults:
+                        continue
+                    element = self._materialize(index)
+                changeset = element._changeset  # pylint: disable=protected-access
+                for attr, value in zip(attrs, row, strict=True):
+                    if getattr(element, attr) != value:
+                        setattr(element, attr, value)
+                        changeset[attr] = value
+                if changeset:
+                    element._notify()  # pylint: disable=protected-access
+
+    @property
+    def element_type(self) -> str:
+        """Name of the type of element; the same as the Elk attribute name."""
+        return self.__class__.__name__.lower()
 
     def get_descriptions(self, text_desc: TextDescription) -> None:
         """Gets the descriptions for specified type."""
         self._text_desc = text_desc
+        self._desc_started = time.monotonic()
+        self._desc_round_trips = 0
+        self._desc_seen = set()
+        self._sync_progress("started")
         self._connection.send(sd_encode(text_desc.desc_type, 0))
 
+    def _sync_progress(self, status: str) -> None:
+        self._notifier.notify(
+            "sync_progress",
+            {
+                "element_type": self.element_type,
+                "status": status,
+                "elapsed": time.monotonic() - self._desc_started,
+                "round_trips": self._desc_round_trips,
+            },
+        )
+
     def _sd_handler(
         self, desc_type: int, unit: int, desc: str, show_on_keypad: bool
     ) -> None:
         if not self._text_desc or desc_type != self._text_desc.desc_type:
             return
-        if unit < 0 or unit >= self._text_desc.number_descriptions:
+        self._desc_round_trips += 1
+        number_descriptions = min(
+            self._text_desc.number_descriptions, self.max_elements
+        )
+        if unit < 0 or unit >= number_descriptions:
             self._text_desc = None
+            self._forget_removed_descriptions()
+            self._sync_progress("finished")
+            self._descriptions_retrieved()
             return
+        self._sync_progress("description")
 
         if desc_type != TextDescriptions.USER.value.desc_type or not re.match(
             r"USER \d\d\d$", desc
         ):
-            element = self.elements[unit]
+            element = self[unit]
             element.setattr("name", desc, True)
             element._configured = True  # pylint: disable=protected-access
             element._configured_was_set()  # pylint: disable=protected-access
-        self._connection.send(sd_encode(desc_type, unit + 1), priority_send=True)
+            self._activate(unit)
+            self._desc_seen.add(unit)
+        self._connection.send(
+            sd_encode(desc_type, unit + 1), priority_send=self._desc_priority
+        )
+
+    def _forget_removed_descriptions(self) -> None:
+        """Unconfigure elements loaded from a cache that the panel no longer names."""
+        for index in self._desc_loaded - self._desc_seen:
+            element = self[index]
+            element._configured = False  # pylint: disable=protected-access
+            element.setattr("name", element.default_name(), True)
+            # An element can still be in use without a name, e.g. a zone
+            if (
+                self._active is not None
+                and index in self._active
+                and not self._is_active(element)
+            ):
+                self._active.remove(index)
+        self._desc_loaded = set()
+
+    def _descriptions_retrieved(self) -> None:
+        """Called when all the descriptions have been retrieved."""
+
+    def descriptions(self) -> dict[int, str]:
+        """Names of the configured elements, by index."""
+        return {
+            element.index: element.name
+            for element in self._materialized()
+            if element.configured
+        }
+
+    def load_descriptions(self, descriptions: dict[int, str]) -> None:
+        """Name and configure elements from previously retrieved descriptions.
+
+        Descriptions are still retrieved from the panel on sync to pick up
+        any changes, but without jumping ahead of other queued messages.
+        """
+        for index, name in descriptions.items():
+            if 0 <= index < self.max_elements:
+                element = self[index]
+                element.setattr("name", name, True)
+                element._configured = True  # pylint: disable=protected-access
+                self._desc_loaded.add(index)
+        self._desc_priority = False
 
-    @abstractmethod
     def sync(self) -> None:
         """Synchronize elements"""
+        self.sync_state()
+        self.sync_config()
+
+    def sync_state(self) -> None:
+        """Retrieve live state; the first stage of synchronizing."""
+
+    @abstractmethod
+    def sync_config(self) -> None:
+        """Retrieve descriptions, etc; the second stage of synchronizing."""
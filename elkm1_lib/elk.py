@@ -4,17 +4,34 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from contextlib import AbstractAsyncContextManager
+from functools import partial
 from typing import Any
 
 from .areas import Areas
-from .connection import Connection
+from .cache import DescriptionCache
+from .connection import BATCH_WAIT_TIME, Connection
 from .counters import Counters
+from .elements import Elements
+from .eventlog import EventLog
 from .keypads import Keypads
 from .lights import Lights
-from .message import MessageEncode, MsgHandler, ua_encode
+from .message import (
+    MessageEncode,
+    MsgHandler,
+    as_encode,
+    cs_encode,
+    ss_encode,
+    ua_encode,
+    zs_encode,
+)
 from .notify import Notifier
 from .outputs import Outputs
 from .panel import Panel
+from .poller import Poller
 from .settings import Settings
 from .tasks import Tasks
 from .thermostats import Thermostats
@@ -44,6 +61,11 @@ class Elk:
         self._notifier = Notifier()
         self._connection = Connection(config["url"], self._notifier)
         self._logged_in = False
+        self._sync_stages: deque[Callable[[], None]] = deque()
+        self._sync_started = 0.0
+        self._synced = False
+        self._disconnected_at: float | None = None
+        self._sync_report: dict[str, Any] = {}
 
         # Setup for all the types of elements tracked
         if "element_list" in config:
@@ -68,6 +90,7 @@ class Elk:
         self._notifier.attach("login", self._login_status)
         self._notifier.attach("IE", self._call_sync_handlers)
         self._notifier.attach("VN", self._got_first_message)
+        self._notifier.attach("sync_progress", self._sync_progress)
 
         self.areas = Areas(self._connection, self._notifier)
         self.counters = Counters(self._connection, self._notifier)
@@ -80,6 +103,63 @@ class Elk:
         self.thermostats = Thermostats(self._connection, self._notifier)
         self.users = Users(self._connection, self._notifier)
         self.zones = Zones(self._connection, self._notifier)
+        for name, max_elements in config.get("max_elements", {}).items():
+            getattr(self, name).limit(max_elements)
+
+        if rate_limit := config.get("rate_limit"):
+            self._set_rate_limit(rate_limit)
+
+        self._poller: Poller | None = None
+        if config.get("poll_interval"):
+            self._poller = self._create_poller(config["poll_interval"])
+
+        self._description_cache: DescriptionCache | None = None
+        self._cache_saving: asyncio.Future[None] | None = None
+        self._cache_changed = False
+        if config.get("description_cache"):
+            self._description_cache = DescriptionCache(config["description_cache"])
+            self._notifier.attach("VN", self._load_description_cache)
+
+        self.event_log: EventLog | None = None
+        if config.get("event_log"):
+            self.event_log = EventLog(config["event_log"])
+            self._notifier.attach("LD", self.event_log.add)
+
+    def _set_rate_limit(
+        self, rate_limit: dict[str, Sequence[float | None]] | Sequence[float | None]
+    ) -> None:
+        # A (messages, bytes) pair applies the same budget to both classes
+        if not isinstance(rate_limit, dict):
+            rate_limit = {"normal": rate_limit, "priority": rate_limit}
+        for priority_class, (messages, size) in rate_limit.items():
+            if priority_class not in ("normal", "priority"):
+                raise ValueError(f"Unknown rate_limit class '{priority_class}'")
+            self._connection.set_rate_limit(
+                messages, size, priority=priority_class == "priority"
+            )
+
+    def _create_poller(self, interval: float | tuple[float, float]) -> Poller:
+        # A single interval is the quickest; quiet panels back off to 10x that
+        min_interval, max_interval = (
+            interval
+            if isinstance(interval, list | tuple)
+            else (interval, interval * 10)
+        )
+        polls: list[Callable[[], None]] = [
+            partial(self._connection.send, encoder())
+            for element, encoder in (
+                ("zones", zs_encode),
+                ("areas", as_encode),
+                ("outputs", cs_encode),
+                ("panel", ss_encode),
+            )
+            if element in self.element_list
+        ]
+        if "thermostats" in self.element_list:
+            polls.append(self.thermostats.refresh)
+        return Poller(
+            self._connection, self._notifier, polls, min_interval, max_interval
+        )
 
     def _login_status(self, succeeded: bool) -> None:
         self._logged_in = succeeded
@@ -95,25 +175,150 @@ class Elk:
         if url_scheme_is_secure(self._config["url"]):
             self._connection.send_raw(self._config["userid"])
             self._connection.send_raw(self._config["password"])
-        self._call_sync_handlers()
+
+        # After a short disconnect only the live state may have changed
+        resync_window = self._config.get("resync_window", 0)
+        full = not (
+            self._synced
+            and self._disconnected_at is not None
+            and time.monotonic() - self._disconnected_at <= resync_window
+        )
+        self._call_sync_handlers(full)
 
     def _disconnected(self) -> None:
         self._logged_in = False
+        self._disconnected_at = time.monotonic()
+
+    def _element_collections(self) -> dict[str, Elements[Any]]:
+        return {
+            name: getattr(self, name)
+            for name in self.element_list
+            if isinstance(getattr(self, name), Elements)
+        }
+
+    def _load_description_cache(self, elkm1_version: str, xep_version: str) -> None:
+        # Only the first connect; after that elements have their names
+        self._notifier.detach("VN", self._load_description_cache)
+        if not self._description_cache:
+            return
+        version, descriptions = self._description_cache.load(self._config["url"])
+        if version != f"{elkm1_version}/{xep_version}":
+            return
+        collections = self._element_collections()
+        for name, names in descriptions.items():
+            if name in collections:
+                collections[name].load_descriptions(names)
+
+    def _save_description_cache(self) -> None:
+        if not self._description_cache:
+            return
+        # One write at a time; later changes are saved when it finishes
+        if self._cache_saving:
+            self._cache_changed = True
+            return
+        version = f"{self.panel.elkm1_version}/{self.panel.xep_version}"
+        descriptions = {
+            name: collection.descriptions()
+            for name, collection in self._element_collections().items()
+        }
+        self._cache_saving = asyncio.get_running_loop().run_in_executor(
+            None,
+            self._description_cache.save,
+            self._config["url"],
+            version,
+            descriptions,
+        )
+        self._cache_saving.add_done_callback(self._description_cache_saved)
+
+    def _description_cache_saved(self, _: asyncio.Future[None]) -> None:
+        self._cache_saving = None
+        if self._cache_changed:
+            self._cache_changed = False
+            self._save_description_cache()
+
+    def _sync_progress(
+        self, element_type: str, status: str, elapsed: float, round_trips: int
+    ) -> None:
+        if status == "finished":
+            self._sync_report.setdefault("descriptions", {})[element_type] = {
+                "elapsed": elapsed,
+                "round_trips": round_trips,
+            }
+            # Descriptions refreshed in the background after sync_complete
+            if self._synced and not self._sync_stages and self.panel.elkm1_version:
+                self._save_description_cache()
 
-    def _sync_complete(self, **_: dict[str, Any]) -> None:
+    @property
+    def sync_report(self) -> dict[str, Any]:
+        """Timing of the last sync.
+
+        Seconds from the start of sync to state_ready and sync_complete and,
+        per element type, seconds and round trips to retrieve descriptions.
+        """
+        return self._sync_report
+
+    def _state_ready(self) -> None:
+        self._sync_report["state_ready"] = time.monotonic() - self._sync_started
+        self._notifier.notify("state_ready", {})
+
+    def _sync_complete(self) -> None:
+        if self._config.get("auto_size") and self._sync_report.get("full", True):
+            for collection in self._element_collections().values():
+                collection.auto_size()
+        self._synced = True
+        self._sync_report["sync_complete"] = time.monotonic() - self._sync_started
+        if self.panel.elkm1_version:
+            self._save_description_cache()
         self._notifier.notify("sync_complete", {})
 
-        # Remove so that other apps can send UA and not trigger sync_complete
-        self._notifier.detach("UA", self._sync_complete)
+    def _refresh_values(self) -> None:
+        # Counter values and thermostat settings are only requested for
+        # elements that descriptions showed to be configured
+        for element in ("counters", "thermostats"):
+            if element in self.element_list:
+                getattr(self, element).refresh()
+        self.send(ua_encode(0))  # Used to mark end of sync
+
+    def _sync_stage_done(self, **_: dict[str, Any]) -> None:
+        if self._sync_stages:
+            self._sync_stages.popleft()()
+        if not self._sync_stages:
+            # Remove so that other apps can send UA and not trigger sync events
+            self._notifier.detach("UA", self._sync_stage_done)
+
+    def _resync_complete(self) -> None:
+        self._state_ready()
+        self._sync_complete()
 
-    def _call_sync_handlers(self) -> None:
-        """Invoke the synchronization handlers."""
+    def _call_sync_handlers(self, full: bool = True) -> None:
+        """Invoke the synchronization handlers.
 
-        LOG.debug("Synchronizing panel...")
-        self.add_handler("UA", self._sync_complete)
+        Live state (arming, zone, output, light status) is requested first
+        and state_ready is sent when it has all been received. Descriptions
+        and other configuration follow, then counter values and thermostat
+        settings, ending with sync_complete. When not
+        a full sync, only the live state is retrieved.
+        """
+
+        LOG.debug("Synchronizing panel%s...", "" if full else " (live state only)")
+        self._sync_started = time.monotonic()
+        self._sync_report = {"descriptions": {}, "full": full}
+        if full:
+            self._sync_stages = deque(
+                [self._state_ready, self._refresh_values, self._sync_complete]
+            )
+        else:
+            self._sync_stages = deque([self._resync_complete])
+        self.add_handler("UA", self._sync_stage_done)
         for element in self.element_list:
-            getattr(self, element).sync()
-        self.send(ua_encode(0))  # Used to mark end of sync
+            getattr(self, element).sync_state()
+        self.send(ua_encode(0))  # Used to mark end of live state
+        if not full:
+            return
+
+        for element in self.element_list:
+            getattr(self, element).sync_config()
+        self.send(ua_encode(0))  # Used to mark end of configuration
 
     @property
     def connection(self) -> Connection:
@@ -147,3 +352,12 @@ class Elk:
     def send(self, msg: MessageEncode) -> None:
         """Helper to connection send."""
         self._connection.send(msg)
+
+    def batch(
+        self,
+        priority: bool = False,
+        wait: bool = False,
+        timeout: float = BATCH_WAIT_TIME,
+    ) -> AbstractAsyncContextManager[None]:
+        """Helper to connection batch."""
+        return self._connection.batch(priority, wait, timeout)
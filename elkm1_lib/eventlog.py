@@ -0,0 +1,159 @@
+"""Persistent store of panel system log (LD) events."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+LOG = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 1.0
+BATCH_SIZE = 100
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS log ("
+    "timestamp REAL NOT NULL, area INTEGER NOT NULL, event INTEGER NOT NULL, "
+    "number INTEGER NOT NULL, log_index INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS log_time ON log (timestamp)",
+    "CREATE INDEX IF NOT EXISTS log_area_time ON log (area, timestamp)",
+    "CREATE INDEX IF NOT EXISTS log_event_time ON log (event, timestamp)",
+)
+
+Row = tuple[float, int, int, int, int]
+
+
+class EventLog:
+    """SQLite (WAL mode) log of LD events, written in batches off the loop.
+
+    Events are held in memory for up to flush_interval seconds, or until
+    batch_size have arrived, then written in one transaction by a single
+    worker thread. Call close() before exiting to write held events.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = FLUSH_INTERVAL,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        self._path = path
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._db: sqlite3.Connection | None = None
+        self._pending: list[Row] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._writing: asyncio.Future[None] | None = None
+
+    def add(self, area: int, log: dict[str, Any]) -> None:
+        """Handler for LD messages; queue the event to be written."""
+        timestamp = dt.datetime.fromisoformat(log["timestamp"]).timestamp()
+        self._pending.append(
+            (timestamp, area, log["event"], log["number"], log["index"])
+        )
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self._flush_interval, self.flush
+            )
+
+    def flush(self) -> asyncio.Future[None]:
+        """Start writing queued events; the future completes when written."""
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        rows, self._pending = self._pending, []
+        loop = asyncio.get_running_loop()
+        if rows:
+            self._writing = loop.run_in_executor(self._executor, self._write, rows)
+        elif not self._writing:
+            self._writing = loop.create_future()
+            self._writing.set_result(None)
+        return self._writing
+
+    async def query(
+        self,
+        area: int | None = None,
+        event: int | None = None,
+        start: dt.datetime | None = None,
+        end: dt.datetime | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Events matching all the given filters, oldest first.
+
+        start is inclusive and end exclusive. Events are returned in the same
+        form as LD messages: area, event, number, index and timestamp.
+        """
+        clauses = []
+        params: list[Any] = []
+        for clause, value in (
+            ("area = ?", area),
+            ("event = ?", event),
+            ("timestamp >= ?", start.timestamp() if start else None),
+            ("timestamp < ?", end.timestamp() if end else None),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = "SELECT timestamp, area, event, number, log_index FROM log"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp, rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        await self.flush()
+        rows = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._read, sql, params
+        )
+        return [
+            {
+                "area": area_,
+                "event": event_,
+                "number": number,
+                "index": index,
+                "timestamp": dt.datetime.fromtimestamp(timestamp, dt.UTC).isoformat(),
+            }
+            for timestamp, area_, event_, number, index in rows
+        ]
+
+    async def close(self) -> None:
+        """Write queued events and close the database."""
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=False)
+
+    # The methods below run on the worker thread only
+
+    def _open(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self._path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                self._db.execute(statement)
+            self._db.commit()
+        return self._db
+
+    def _write(self, rows: list[Row]) -> None:
+        try:
+            with self._open() as db:
+                db.executemany("INSERT INTO log VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as exc:
+            LOG.warning(
+                "Unable to write %d events to %s: %s", len(rows), self._path, exc
+            )
+
+    def _read(self, sql: str, params: list[Any]) -> list[Row]:
+        return self._open().execute(sql, params).fetchall()
+
+    def _close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,112 @@
+"""Fixed size history of attribute changes for an element."""
+
+from __future__ import annotations
+
+import time
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+HistoryEntry = tuple[float, str, Any]
+
+
+class History:
+    """Ring buffer of (timestamp, attribute, value) changes.
+
+    Timestamps and attribute ids are kept in arrays and values in a fixed
+    size list, so recording a change allocates nothing once the buffer is
+    full. Only the attributes given are recorded; all of them if None.
+    """
+
+    def __init__(self, size: int, attrs: Iterable[str] | None = None) -> None:
+        if size < 1:
+            raise ValueError(f"History size must be at least 1, got {size}")
+        self._size = size
+        self._watched = frozenset(attrs) if attrs is not None else None
+        self._attr_names: list[str] = []
+        self._attr_ids: dict[str, int] = {}
+        self._times = array("d", bytes(8 * size))
+        self._attrs = array("H", bytes(2 * size))
+        self._values: list[Any] = [None] * size
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        return self.entries()
+
+    def record(self, changeset: dict[str, Any], timestamp: float | None = None) -> None:
+        """Add the attributes changed in changeset."""
+        if timestamp is None:
+            timestamp = time.time()
+        for attr, value in changeset.items():
+            if self._watched is not None and attr not in self._watched:
+                continue
+            attr_id = self._attr_ids.get(attr)
+            if attr_id is None:
+                attr_id = self._attr_ids[attr] = len(self._attr_names)
+                self._attr_names.append(attr)
+            position = self._next
+            self._times[position] = timestamp
+            self._attrs[position] = attr_id
+            self._values[position] = value
+            self._next = (position + 1) % self._size
+            self._count = min(self._count + 1, self._size)
+
+    def clear(self) -> None:
+        """Forget all recorded changes."""
+        self._values = [None] * self._size
+        self._next = 0
+        self._count = 0
+
+    def _positions(self, newest_first: bool) -> Iterator[int]:
+        start = (self._next - self._count) % self._size
+        offsets = range(self._count - 1, -1, -1) if newest_first else range(self._count)
+        for offset in offsets:
+            yield (start + offset) % self._size
+
+    def _matching(
+        self,
+        attr: str | None,
+        since: float | None,
+        newest_first: bool = False,
+    ) -> Iterator[int]:
+        if attr is not None:
+            attr_id = self._attr_ids.get(attr)
+            if attr_id is None:
+                return
+        for position in self._positions(newest_first):
+            if since is not None and self._times[position] < since:
+                if newest_first:
+                    return
+                continue
+            if attr is None or self._attrs[position] == attr_id:
+                yield position
+
+    def entries(
+        self, attr: str | None = None, since: float | None = None
+    ) -> Iterator[HistoryEntry]:
+        """Changes, oldest first, optionally of one attribute and since a time."""
+        for position in self._matching(attr, since):
+            yield (
+                self._times[position],
+                self._attr_names[self._attrs[position]],
+                self._values[position],
+            )
+
+    def last(self, attr: str, value: Any = None) -> HistoryEntry | None:
+        """Most recent change of attr (to value, if given), or None."""
+        for position in self._matching(attr, None, newest_first=True):
+            if value is None or self._values[position] == value:
+                return (self._times[position], attr, self._values[position])
+        return None
+
+    def count(self, attr: str, value: Any = None, since: float | None = None) -> int:
+        """Number of changes of attr (to value, if given) since a time."""
+        return sum(
+            1
+            for position in self._matching(attr, since, newest_first=True)
+            if value is None or self._values[position] == value
+        )
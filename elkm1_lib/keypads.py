@@ -30,6 +30,8 @@ class Keypad(Element):
 class Keypads(Elements[Keypad]):
     """Handling for multiple areas"""
 
+    indexed_attrs = ("area",)
+
     def __init__(self, connection: Connection, notifier: Notifier) -> None:
         super().__init__(connection, notifier, Keypad, Max.KEYPADS.value)
         notifier.attach("IC", self._ic_handler)
@@ -39,15 +41,19 @@ class Keypads(Elements[Keypad]):
         notifier.attach("LW", self._lw_handler)
         notifier.attach("ST", self._st_handler)
 
-    def sync(self) -> None:
-        """Retrieve areas from ElkM1"""
+    def sync_state(self) -> None:
+        """Retrieve keypad areas from ElkM1"""
         self._connection.send(ka_encode())
+
+    def sync_config(self) -> None:
+        """Retrieve areas from ElkM1"""
         self.get_descriptions(TextDescriptions.KEYPAD.value)
         # Send KF for one of our keypads which reports them all
         self._connection.send(kf_encode(0))
 
     def _ic_handler(self, code: int, user: int, keypad: int) -> None:
-        keypad_ = self.elements[keypad]
+        if not (keypad_ := self._get(keypad)):
+            return
 
         # By setting a time this will force the IC change to always be reported
         keypad_.setattr("last_user_time", dt.datetime.now(dt.UTC), False)
@@ -57,9 +63,10 @@ class Keypads(Elements[Keypad]):
         keypad_.setattr("last_user", user, True)
 
     def _ka_handler(self, keypad_areas: list[int]) -> None:
-        for keypad in self.elements:
-            if keypad_areas[keypad.index] >= 0:
-                keypad.setattr("area", keypad_areas[keypad.index], True)
+        with self._batch_changes():
+            for index, area in enumerate(keypad_areas[: self.max_elements]):
+                if area >= 0:
+                    self[index].setattr("area", area, True)
 
     def _kc_handler(self, keypad: int, key: int) -> None:
         """
@@ -68,31 +75,35 @@ class Keypads(Elements[Keypad]):
         """
 
         # Ignore NO_KEY as it is not a key press
-        if key == KeypadKeys.NO_KEY.value:
+        if key == KeypadKeys.NO_KEY.value or not (keypad_ := self._get(keypad)):
             return
 
         # Force a change notification
-        self.elements[keypad].last_keypress = None
+        keypad_.last_keypress = None
         try:
             name = KeypadKeys(key).name
         except ValueError:
             name = ""
-        self.elements[keypad].setattr("last_keypress", (name, key), True)
+        keypad_.setattr("last_keypress", (name, key), True)
 
     def _kf_handler(self, keypad: int, key: str, chime_mode: list[int]) -> None:
+        if not (keypad_ := self._get(keypad)):
+            return
+
         # Force a change notification
-        self.elements[keypad].last_function_key = FunctionKeys.FORCE_KF_SYNC
+        keypad_.last_function_key = FunctionKeys.FORCE_KF_SYNC
         try:
             name = FunctionKeys(key).name
         except ValueError:
             name = ""
-        self.elements[keypad].setattr("last_function_key", (name, key), True)
+        keypad_.setattr("last_function_key", (name, key), True)
 
     def _lw_handler(self, keypad_temps: list[int], zone_temps: list[int]) -> None:
-        for keypad in self.elements:
-            if keypad_temps[keypad.index] > -40:
-                keypad.setattr("temperature", keypad_temps[keypad.index], True)
+        with self._batch_changes():
+            for index, temperature in enumerate(keypad_temps[: self.max_elements]):
+                if temperature > -40:
+                    self[index].setattr("temperature", temperature, True)
 
     def _st_handler(self, group: int, device: int, temperature: int) -> None:
-        if group == 1:
-            self.elements[device].setattr("temperature", temperature, True)
+        if group == 1 and (keypad := self._get(device)):
+            keypad.setattr("temperature", temperature, True)
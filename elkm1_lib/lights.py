@@ -1,5 +1,10 @@
 """Definition of an ElkM1 Light"""
 
+import asyncio
+from collections.abc import Coroutine
+from functools import partial
+from typing import Any
+
 from .connection import Connection
 from .const import Max, TextDescriptions
 from .elements import Element, Elements
@@ -36,15 +41,69 @@ class Lights(Elements[Light]):
         notifier.attach("PC", self._pc_handler)
         notifier.attach("PS", self._ps_handler)
 
-    def sync(self) -> None:
+    def sync_state(self) -> None:
+        """Retrieve light levels from ElkM1"""
+        # Once descriptions are known only the banks with named lights are needed
+        if self._active is None:
+            banks = list(range(4))
+        else:
+            banks = sorted({index // 64 for index in self._active})
+        for bank in banks:
+            self._connection.send(ps_encode(bank))
+
+    def sync_config(self) -> None:
         """Retrieve lights from ElkM1"""
-        for i in range(4):
-            self._connection.send(ps_encode(i))
         self.get_descriptions(TextDescriptions.LIGHT.value)
 
+    def load_descriptions(self, descriptions: dict[int, str]) -> None:
+        super().load_descriptions(descriptions)
+        self.auto_size()
+
+    def _descriptions_retrieved(self) -> None:
+        self.auto_size()
+
+    def apply_scene(
+        self, scene: dict[int, int], time: int = 0, timeout: float = 10.0
+    ) -> asyncio.Future[bool]:
+        """(Helper) Set a group of lights, given as {index: level, ...}.
+
+        Lights already at their level are skipped. Returns a future that is
+        True once every light that was set reports its new level, or False if
+        timeout seconds pass first. Call from the event loop.
+        """
+        waits = []
+        for index, level in scene.items():
+            light = self[index]
+            target = _reported_status(level)
+            if light.status == target:
+                continue
+            light.level(level, time)
+            waits.append(
+                light.wait_for(partial(_status_is, target), ("status",), timeout)
+            )
+        return asyncio.ensure_future(_all_true(waits))
+
     def _pc_handler(self, housecode: str, index: int, light_level: int) -> None:
-        self.elements[index].setattr("status", light_level, True)
+        if light := self._get(index):
+            light.setattr("status", light_level, True)
 
     def _ps_handler(self, bank: int, statuses: list[int]) -> None:
-        for i in range(bank * 64, (bank + 1) * 64):
-            self.elements[i].setattr("status", statuses[i - bank * 64], True)
+        self._update_columns({"status": statuses}, bank * 64, active_only=True)
+
+
+async def _all_true(waits: list[Coroutine[Any, Any, bool]]) -> bool:
+    return all(await asyncio.gather(*waits))
+
+
+def _reported_status(level: int) -> int:
+    """Status the panel reports after Light.level(level)."""
+    # Levels of 98 and over are sent as on, which is reported as 1
+    if level <= 0:
+        return 0
+    if level >= 98:
+        return 1
+    return level
+
+
+def _status_is(status: int, light: Light) -> bool:
+    return light.status == status
@@ -404,6 +404,30 @@ def get_elk_command(line: str) -> str:
     return line[2:4]
 
 
+def replace_key(message: str) -> str | None:
+    """Return a key shared by messages where only the newest needs sending.
+
+    Setpoints, custom values, counter values, and light levels for the same
+    target are last writer wins; toggles and everything else are not.
+    """
+    command = get_elk_command(message)
+    if command == "ts":
+        # Thermostat number and setting
+        return f"ts{message[4:6]}{message[8:9]}"
+    if command in ("cw", "cx"):
+        return message[2:6]
+    if command in ("pc", "pf", "pn"):
+        return f"pc{message[4:7]}"
+    return None
+
+
+def toggle_key(message: str) -> str | None:
+    """Return the replace_key of the value that a toggle message flips."""
+    if get_elk_command(message) == "pt":
+        return f"pc{message[4:7]}"
+    return None
+
+
 def _status_decode(status: int) -> tuple[ZoneLogicalStatus, ZonePhysicalStatus]:
     """Decode a 1 byte status into logical and physical statuses."""
     logical_status = ZoneLogicalStatus((status & 0b00001100) >> 2)
@@ -1,5 +1,8 @@
 """Definition of an ElkM1 Output"""
 
+import asyncio
+from functools import partial
+
 from .connection import Connection
 from .const import Max, TextDescriptions
 from .elements import Element, Elements
@@ -35,14 +38,44 @@ class Outputs(Elements[Output]):
         notifier.attach("CC", self._cc_handler)
         notifier.attach("CS", self._cs_handler)
 
-    def sync(self) -> None:
-        """Retrieve areas from ElkM1"""
+    def sync_state(self) -> None:
+        """Retrieve output status from ElkM1"""
         self._connection.send(cs_encode())
+
+    def sync_config(self) -> None:
+        """Retrieve areas from ElkM1"""
         self.get_descriptions(TextDescriptions.OUTPUT.value)
 
+    def set_many(
+        self, states: dict[int, bool], time: int = 0, timeout: float = 10.0
+    ) -> dict[int, asyncio.Future[bool]]:
+        """(Helper) Turn a group of outputs on or off, given as {index: on, ...}.
+
+        Outputs already in the requested state are skipped. Returns a future
+        per output sent that is True when its CC confirmation is received, or
+        False if timeout seconds pass first. Call from the event loop.
+        """
+        confirmations: dict[int, asyncio.Future[bool]] = {}
+        for index, output_on in states.items():
+            output = self[index]
+            if output.output_on == output_on:
+                continue
+            if output_on:
+                output.turn_on(time)
+            else:
+                output.turn_off()
+            confirmations[index] = asyncio.ensure_future(
+                output.wait_for(partial(_output_is, output_on), ("output_on",), timeout)
+            )
+        return confirmations
+
     def _cc_handler(self, output: int, output_status: bool) -> None:
-        self.elements[output].setattr("output_on", output_status, True)
+        if element := self._get(output):
+            element.setattr("output_on", output_status, True)
 
     def _cs_handler(self, output_status: list[bool]) -> None:
-        for output in self.elements:
-            output.setattr("output_on", output_status[output.index], True)
+        self._update_columns({"output_on": output_status}, active_only=True)
+
+
+def _output_is(output_on: bool, output: Output) -> bool:
+    return output.output_on == output_on
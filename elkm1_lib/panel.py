@@ -35,11 +35,19 @@ class Panel(Element):
 
     def sync(self) -> None:
         """Retrieve panel information from ElkM1"""
+        self.sync_state()
+        self.sync_config()
+
+    def sync_state(self) -> None:
+        """Retrieve panel version and trouble status from ElkM1"""
         self._connection.send(vn_encode())
-        self._connection.send(lw_encode())
         self._connection.send(ss_encode())
         # Don't sync UA from here as it is used as a "sync complete" marker
 
+    def sync_config(self) -> None:
+        """Retrieve panel temperatures from ElkM1"""
+        self._connection.send(lw_encode())
+
     def speak_word(self, word: int) -> None:
         """(Helper) Speak word."""
         self._connection.send(sw_encode(word))
@@ -0,0 +1,72 @@
+"""Background polling of panel state to recover from lost updates."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from .connection import Connection
+from .notify import Notifier
+
+LOG = logging.getLogger(__name__)
+IDLE_CHECK_TIME = 1.0
+
+
+class Poller:
+    """Periodically re-request state that is normally sent unsolicited.
+
+    The interval doubles after each quiet poll, up to max_interval, and drops
+    back to min_interval after a message times out. Polls are only sent when
+    nothing else is queued and are skipped while the connection is paused.
+    """
+
+    def __init__(
+        self,
+        connection: Connection,
+        notifier: Notifier,
+        polls: list[Callable[[], None]],
+        min_interval: float,
+        max_interval: float,
+    ) -> None:
+        self._connection = connection
+        self._polls = polls
+        self._min_interval = min_interval
+        self._max_interval = max(min_interval, max_interval)
+        self.interval = min_interval
+        self._errors = False
+        self._task: asyncio.Task[None] | None = None
+
+        notifier.attach("connected", self._connected)
+        notifier.attach("disconnected", self._disconnected)
+        notifier.attach("timeout", self._timeout)
+
+    def _connected(self) -> None:
+        self._disconnected()
+        self.interval = self._min_interval
+        self._task = asyncio.create_task(self._run())
+
+    def _disconnected(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _timeout(self, **_: Any) -> None:
+        self._errors = True
+        self.interval = self._min_interval
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            while not self._connection.is_idle():
+                await asyncio.sleep(IDLE_CHECK_TIME)
+            if self._connection.is_paused():
+                continue
+
+            LOG.debug("Polling panel state, next in %s seconds", self.interval)
+            for poll in self._polls:
+                poll()
+            if not self._errors:
+                self.interval = min(self.interval * 2, self._max_interval)
+            self._errors = False
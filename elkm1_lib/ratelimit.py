@@ -0,0 +1,86 @@
+"""Token bucket pacing of messages written to the panel."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+
+class TokenBucket:
+    """Tokens refill at rate per second, holding at most one second's worth."""
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available (negative while repaying a large send)."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def delay(self, cost: float) -> float:
+        """Seconds until cost tokens can be spent."""
+        # Costs larger than the bucket are allowed once it is full
+        needed = min(cost, self.capacity) - self.tokens
+        return max(needed, 0.0) / self.rate
+
+    def consume(self, cost: float) -> None:
+        """Spend cost tokens."""
+        self._refill()
+        self._tokens -= cost
+
+
+class RateLimiter:
+    """Message and byte budgets for one priority class of writes."""
+
+    def __init__(
+        self,
+        messages_per_second: float | None = None,
+        bytes_per_second: float | None = None,
+    ) -> None:
+        self._messages = (
+            TokenBucket(messages_per_second) if messages_per_second else None
+        )
+        self._bytes = TokenBucket(bytes_per_second) if bytes_per_second else None
+        self.delayed = 0
+        self.delay_time = 0.0
+
+    def delay(self, size: int) -> float:
+        """Seconds until a message of size bytes can be written."""
+        return max(
+            self._messages.delay(1) if self._messages else 0.0,
+            self._bytes.delay(size) if self._bytes else 0.0,
+        )
+
+    def consume(self, size: int, delayed: float = 0.0) -> None:
+        """Account for a message of size bytes that was held for delayed seconds."""
+        if self._messages:
+            self._messages.consume(1)
+        if self._bytes:
+            self._bytes.consume(size)
+        if delayed:
+            self.delayed += 1
+            self.delay_time += delayed
+
+    def state(self) -> dict[str, Any]:
+        """Current budgets and totals, for metrics."""
+        return {
+            "messages_per_second": self._messages.rate if self._messages else None,
+            "bytes_per_second": self._bytes.rate if self._bytes else None,
+            "message_tokens": self._messages.tokens if self._messages else None,
+            "byte_tokens": self._bytes.tokens if self._bytes else None,
+            "delayed": self.delayed,
+            "delay_time": self.delay_time,
+        }
@@ -36,14 +36,14 @@ class Settings(Elements[Setting]):
         super().__init__(connection, notifier, Setting, Max.SETTINGS.value)
         notifier.attach("CR", self._cr_handler)
 
-    def sync(self) -> None:
+    def sync_config(self) -> None:
         """Retrieve custom values from ElkM1"""
         self._connection.send(cp_encode())
         self.get_descriptions(TextDescriptions.SETTING.value)
 
     def _cr_handler(self, values: list[dict[str, Any]]) -> None:
-        settings = self.elements
         for value in values:
-            setting = settings[value["index"]]
+            if not (setting := self._get(value["index"])):
+                continue
             setting.value_format = value["value_format"]
             setting.value = value["value"]
@@ -28,9 +28,10 @@ class Tasks(Elements[Task]):
         super().__init__(connection, notifier, Task, Max.TASKS.value)
         notifier.attach("TC", self._tc_handler)
 
-    def sync(self) -> None:
+    def sync_config(self) -> None:
         """Retrieve tasks from ElkM1"""
         self.get_descriptions(TextDescriptions.TASK.value)
 
     def _tc_handler(self, task: int) -> None:
-        self.elements[task].setattr("last_change", time(), True)
+        if element := self._get(task):
+            element.setattr("last_change", time(), True)
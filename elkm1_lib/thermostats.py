@@ -56,25 +56,41 @@ class Thermostat(Element):
 
         self._connection.send(ts_encode(self.index, setting, element_to_set))
 
-    def _configured_was_set(self) -> None:
-        self._connection.send(tr_encode(self.index), priority_send=True)
-
 
 class Thermostats(Elements[Thermostat]):
     """Handling for multiple areas"""
 
     def __init__(self, connection: Connection, notifier: Notifier) -> None:
         super().__init__(connection, notifier, Thermostat, Max.THERMOSTATS.value)
+        self._refreshed: set[int] | None = None
         notifier.attach("ST", self._st_handler)
         notifier.attach("TR", self._tr_handler)
 
-    def sync(self) -> None:
+    def sync_config(self) -> None:
         """Retrieve areas from ElkM1"""
+        self._refreshed = None
         self.get_descriptions(TextDescriptions.THERMOSTAT.value)
 
+    def refresh(self) -> None:
+        """Retrieve the settings of all configured thermostats."""
+        self._refreshed = set()
+        self._request_values(self._refreshed)
+
+    def _descriptions_retrieved(self) -> None:
+        # Descriptions loaded from the cache are refreshed after the values
+        # were requested; request them for any newly configured thermostats
+        if self._refreshed is not None:
+            self._request_values(self._refreshed)
+
+    def _request_values(self, requested: set[int]) -> None:
+        for thermostat in self._materialized():
+            if thermostat.configured and thermostat.index not in requested:
+                requested.add(thermostat.index)
+                self._connection.send(tr_encode(thermostat.index))
+
     def _st_handler(self, group: int, device: int, temperature: int) -> None:
-        if group == 2:
-            self.elements[device].setattr("current_temp", temperature, True)
+        if group == 2 and (thermostat := self._get(device)):
+            thermostat.setattr("current_temp", temperature, True)
 
     def _tr_handler(
         self,
@@ -87,7 +103,8 @@ class Thermostats(Elements[Thermostat]):
         cool_setpoint: int,
         humidity: int,
     ) -> None:
-        thermostat = self.elements[thermostat_index]
+        if not (thermostat := self._get(thermostat_index)):
+            return
         thermostat.setattr("mode", mode, False)
         thermostat.setattr("hold", hold, False)
         thermostat.setattr("fan", fan, False)
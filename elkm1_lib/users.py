@@ -16,14 +16,14 @@ class Users(Elements[User]):
     def __init__(self, connection: Connection, notifier: Notifier) -> None:
         super().__init__(connection, notifier, User, Max.USERS.value)
 
-    def sync(self) -> None:
+    def sync_config(self) -> None:
         """Retrieve areas from ElkM1"""
         self.get_descriptions(TextDescriptions.USER.value)
 
     def username(self, user_number: int) -> str:
         """Return name of user."""
         if 0 <= user_number < self.max_elements:
-            return self.elements[user_number].name
+            return self[user_number].name
         if user_number == 201:
             return "*Program*"
         if user_number == 202:
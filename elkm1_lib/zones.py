@@ -1,5 +1,8 @@
 """Definition of an ElkM1 Zone"""
 
+import asyncio
+from collections.abc import Iterable
+
 from .connection import Connection
 from .const import (
     Max,
@@ -21,6 +24,29 @@ from .message import (
 )
 from .notify import Notifier
 
+# Zone types whose changes are never held back by a debounce window unless
+# the zone or type is named explicitly in set_debounce
+IMMEDIATE_ZONE_TYPES = frozenset(
+    {
+        ZoneType.BURGLAR24_HOUR,
+        ZoneType.BURGLAR_BOX_TAMPER,
+        ZoneType.FIRE_ALARM,
+        ZoneType.FIRE_VERIFIED,
+        ZoneType.FIRE_SUPERVISORY,
+        ZoneType.CARBON_MONOXIDE,
+        ZoneType.EMERGENCY_ALARM,
+        ZoneType.GAS_ALARM,
+        ZoneType.HEAT_ALARM,
+        ZoneType.MEDICAL_ALARM,
+        ZoneType.POLICE_ALARM,
+        ZoneType.POLICE_NO_INDICATION,
+        ZoneType.WATER_ALARM,
+        ZoneType.FREEZE_ALARM,
+    }
+)
+
+ZoneStatus = tuple[ZoneLogicalStatus, ZonePhysicalStatus]
+
 
 class Zone(Element):
     """Class representing a Zone"""
@@ -34,6 +60,7 @@ class Zone(Element):
         self.voltage = 0
         self.temperature = -60
         self.triggered_alarm = False
+        self.flip_count = 0
 
     def __str__(self) -> str:
         return (
@@ -60,6 +87,8 @@ class Zone(Element):
 class Zones(Elements[Zone]):
     """Handling for multiple zones"""
 
+    indexed_attrs = ("area", "definition", "logical_status", "physical_status")
+
     def __init__(self, connection: Connection, notifier: Notifier) -> None:
         super().__init__(connection, notifier, Zone, Max.ZONES.value)
         notifier.attach("AZ", self._az_handler)
@@ -71,32 +100,104 @@ class Zones(Elements[Zone]):
         notifier.attach("ZP", self._zp_handler)
         notifier.attach("ZS", self._zs_handler)
         notifier.attach("ZV", self._zv_handler)
+        self._debounce_default = 0.0
+        self._debounce_types: dict[ZoneType, float] = {}
+        self._debounce_zones: dict[int, float] = {}
+        self._debounced: dict[int, tuple[ZoneStatus, int, asyncio.TimerHandle]] = {}
 
-    def sync(self) -> None:
-        """Retrieve zones from ElkM1"""
+    def sync_state(self) -> None:
+        """Retrieve zone status and alarms from ElkM1"""
         self._connection.send(az_encode())
+        self._connection.send(zs_encode())
+
+    def sync_config(self) -> None:
+        """Retrieve zones from ElkM1"""
         self._connection.send(zd_encode())
         self._connection.send(zp_encode())
-        self._connection.send(zs_encode())
         self.get_descriptions(TextDescriptions.ZONE.value)
 
+    def set_debounce(
+        self,
+        window: float,
+        zones: Iterable[int] | None = None,
+        zone_types: Iterable[ZoneType] | None = None,
+    ) -> None:
+        """Merge ZC changes for a zone that arrive within window seconds.
+
+        One notification is sent at the end of the window with the final
+        status and flip_count set to the number of changes merged. Applies
+        to the given zones, zone types, or if neither is given all zones
+        other than IMMEDIATE_ZONE_TYPES and zones whose definition is not yet
+        known. A window of 0 removes the debounce.
+        """
+        if window < 0:
+            raise ValueError(f"Debounce window must not be negative, got {window}")
+        if zones is None and zone_types is None:
+            self._debounce_default = window
+        for zone_number in zones or ():
+            self._debounce_zones[zone_number] = window
+        for zone_type in zone_types or ():
+            self._debounce_types[zone_type] = window
+
+    def _debounce_window(self, zone: Zone) -> float:
+        if zone.index in self._debounce_zones:
+            return self._debounce_zones[zone.index]
+        if zone.definition in self._debounce_types:
+            return self._debounce_types[zone.definition]
+        # Definitions arrive in ZD after connecting, until then any zone
+        # could be one that must not be held back
+        if zone.definition in IMMEDIATE_ZONE_TYPES | {ZoneType.DISABLED}:
+            return 0.0
+        return self._debounce_default
+
+    def _debounce(self, zone: Zone, zone_status: ZoneStatus, window: float) -> None:
+        if pending := self._debounced.get(zone.index):
+            last_status, flips, timer = pending
+            if zone_status != last_status:
+                flips += 1
+            self._debounced[zone.index] = (zone_status, flips, timer)
+            return
+        if zone_status == (zone.logical_status, zone.physical_status):
+            return
+        timer = asyncio.get_running_loop().call_later(
+            window, self._debounce_expired, zone.index
+        )
+        self._debounced[zone.index] = (zone_status, 1, timer)
+
+    def _debounce_expired(self, zone_number: int) -> None:
+        zone_status, flips, _ = self._debounced.pop(zone_number)
+        zone = self[zone_number]
+        zone.setattr("logical_status", zone_status[0], False)
+        zone.setattr("physical_status", zone_status[1], False)
+        # Force flip_count into the changeset, even when flipped back
+        zone.flip_count = 0
+        zone.setattr("flip_count", flips, True)
+
+    def _flush_debounced(self, zone_number: int | None = None) -> None:
+        zone_numbers = list(self._debounced) if zone_number is None else [zone_number]
+        for number in zone_numbers:
+            self._debounced[number][2].cancel()
+            self._debounce_expired(number)
+
     def _az_handler(self, alarm_status: list[ZoneAlarmState]) -> None:
-        for zone in self.elements:
-            zone.setattr(
-                "triggered_alarm",
-                alarm_status[zone.index] != ZoneAlarmState.NO_ALARM,
-                True,
-            )
+        self._update_columns(
+            {
+                "triggered_alarm": [
+                    status != ZoneAlarmState.NO_ALARM for status in alarm_status
+                ]
+            },
+            active_only=True,
+        )
 
     def _lw_handler(self, keypad_temps: list[int], zone_temps: list[int]) -> None:
-        for i in range(16):
-            zone = self.elements[i]
-            if zone_temps[zone.index] > -60:
-                zone.setattr("temperature", zone_temps[zone.index], True)
+        with self._batch_changes():
+            for index, temperature in enumerate(zone_temps[: self.max_elements]):
+                if temperature > -60:
+                    self[index].setattr("temperature", temperature, True)
 
     def _st_handler(self, group: int, device: int, temperature: int) -> None:
-        if group == 0:
-            self.elements[device].setattr("temperature", temperature, True)
+        if group == 0 and (zone := self._get(device)):
+            zone.setattr("temperature", temperature, True)
 
     def _zb_handler(self, zone_number: int, zone_bypassed: bool) -> None:
         # If specific zone number was specified, then a ZC (zone change)
@@ -109,25 +210,40 @@ class Zones(Elements[Zone]):
     def _zc_handler(
         self,
         zone_number: int,
-        zone_status: tuple[ZoneLogicalStatus, ZonePhysicalStatus],
+        zone_status: ZoneStatus,
     ) -> None:
-        self.elements[zone_number].setattr("logical_status", zone_status[0], False)
-        self.elements[zone_number].setattr("physical_status", zone_status[1], True)
+        if not (zone := self._get(zone_number)):
+            return
+        if window := self._debounce_window(zone):
+            self._debounce(zone, zone_status, window)
+            return
+        if zone_number in self._debounced:
+            self._flush_debounced(zone_number)
+        zone.setattr("logical_status", zone_status[0], False)
+        zone.setattr("physical_status", zone_status[1], True)
 
     def _zd_handler(self, zone_definitions: list[ZoneType]) -> None:
-        for zone in self.elements:
-            zone.setattr("definition", zone_definitions[zone.index], True)
+        self._update_columns({"definition": zone_definitions})
+        if self._active is not None:
+            self.auto_size()
 
     def _zp_handler(self, zone_partitions: list[int]) -> None:
-        for zone in self.elements:
-            zone.setattr("area", zone_partitions[zone.index], True)
+        self._update_columns({"area": zone_partitions})
+
+    def _zs_handler(self, zone_statuses: list[ZoneStatus]) -> None:
+        # Held back changes are older than this report
+        self._flush_debounced()
+        self._update_columns(
+            {
+                "logical_status": [status[0] for status in zone_statuses],
+                "physical_status": [status[1] for status in zone_statuses],
+            },
+            active_only=True,
+        )
 
-    def _zs_handler(
-        self, zone_statuses: list[tuple[ZoneLogicalStatus, ZonePhysicalStatus]]
-    ) -> None:
-        for zone in self.elements:
-            zone.setattr("logical_status", zone_statuses[zone.index][0], False)
-            zone.setattr("physical_status", zone_statuses[zone.index][1], True)
+    def _is_active(self, element: Zone) -> bool:
+        return element.configured or element.definition != ZoneType.DISABLED
 
     def _zv_handler(self, zone_number: int, zone_voltage: float) -> None:
-        self.elements[zone_number].setattr("voltage", zone_voltage, True)
+        if zone := self._get(zone_number):
+            zone.setattr("voltage", zone_voltage, True)
@@ -1,9 +1,16 @@
+import asyncio
 from unittest.mock import Mock
 
 import pytest
 
 from elkm1_lib.areas import Area, Areas
-from elkm1_lib.const import AlarmState, ArmedStatus, ArmUpState
+from elkm1_lib.const import (
+    AlarmState,
+    ArmedStatus,
+    ArmLevel,
+    ArmResult,
+    ArmUpState,
+)
 from elkm1_lib.message import MessageEncode
 
 from .util import rx_msg
@@ -59,3 +66,53 @@ def test_is_in_alarm_state():
 
     area.alarm_state = AlarmState.POLICE_ALARM
     assert area.in_alarm_state() is True
+
+
+async def test_arm_async_success(areas, notifier):
+    rx_msg("AS", "000000001000000000000000", notifier)
+    areas._connection.send.reset_mock()
+    task = asyncio.ensure_future(areas[0].arm_async(ArmLevel.ARMED_STAY, 1234))
+    await asyncio.sleep(0)
+    areas._connection.send.assert_called_once()
+    rx_msg("EE", "100601202", notifier)
+    assert await task == ArmResult.SUCCESS
+
+
+async def test_arm_async_invalid_code(areas, notifier):
+    rx_msg("AS", "000000001000000000000000", notifier)
+    # Keypad 1 is in area 1 and keypad 2 in area 2
+    rx_msg("KA", "12" + "0" * 14, notifier)
+    task = asyncio.ensure_future(areas[0].arm_async(ArmLevel.ARMED_AWAY, 1))
+    await asyncio.sleep(0)
+    rx_msg("IC", "00000000000100002", notifier)
+    await asyncio.sleep(0)
+    assert not task.done()
+    rx_msg("IC", "00000000000100001", notifier)
+    assert await task == ArmResult.INVALID_CODE
+
+
+async def test_arm_async_not_ready(areas, notifier):
+    rx_msg("AS", "000000000000000000000000", notifier)
+    areas._connection.send.reset_mock()
+    assert await areas[0].arm_async(ArmLevel.ARMED_AWAY, 1) == ArmResult.NOT_READY
+    areas._connection.send.assert_not_called()
+
+
+async def test_force_arm_async_ignores_not_ready(areas, notifier):
+    rx_msg("AS", "000000002000000000000000", notifier)
+    task = asyncio.ensure_future(
+        areas[0].arm_async(ArmLevel.FORCE_ARM_TO_AWAY_MODE, 1234)
+    )
+    await asyncio.sleep(0)
+    rx_msg("AS", "000000000000000000000000", notifier)
+    await asyncio.sleep(0)
+    assert not task.done()
+    rx_msg("EE", "100601201", notifier)
+    assert await task == ArmResult.SUCCESS
+
+
+async def test_arm_async_already_armed_and_timeout(areas, notifier):
+    rx_msg("AS", "100000004000000000000000", notifier)
+    area = areas[0]
+    assert await area.arm_async(ArmLevel.ARMED_AWAY, 1) == ArmResult.ALREADY_ARMED
+    assert await area.disarm_async(1, timeout=0.01) == ArmResult.TIMEOUT
@@ -0,0 +1,75 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from elkm1_lib.cache import DescriptionCache
+from elkm1_lib.const import TextDescriptions, ZoneLogicalStatus
+from elkm1_lib.message import MessageEncode
+from elkm1_lib.zones import Zones
+
+from .util import rx_msg
+
+
+def test_cache_round_trip(tmp_path):
+    cache = DescriptionCache(str(tmp_path / "cache.json"))
+    assert cache.load("elk://1.2.3.4") == (None, {})
+
+    cache.save("elk://1.2.3.4", "5.3.10/2.0.46", {"zones": {0: "Front door"}})
+    cache.save("elk://5.6.7.8", "5.3.10/2.0.46", {"zones": {3: "Back door"}})
+    assert cache.load("elk://1.2.3.4") == (
+        "5.3.10/2.0.46",
+        {"zones": {0: "Front door"}},
+    )
+
+
+def test_cache_unreadable_file_is_ignored(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("not json")
+    assert DescriptionCache(str(path)).load("elk://1.2.3.4") == (None, {})
+
+
+def test_cache_concurrent_saves(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = DescriptionCache(str(path))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for panel in range(8):
+            executor.submit(cache.save, f"elk://{panel}", None, {"zones": {}})
+    assert len(json.loads(path.read_text())) == 8
+    assert [file.name for file in tmp_path.iterdir()] == ["cache.json"]
+
+
+def test_load_descriptions_configures_elements(notifier):
+    connection = Mock()
+    zones = Zones(connection, notifier)
+    zones.load_descriptions({0: "Front door", 4: "Garage"})
+    assert zones[0].name == "Front door"
+    assert zones[4].configured is True
+    assert zones.descriptions() == {0: "Front door", 4: "Garage"}
+
+    # Refresh of descriptions from the panel is not sent as priority
+    zones.get_descriptions(TextDescriptions.ZONE.value)
+    rx_msg("SD", "00001Front door      0", notifier)
+    connection.send.assert_called_with(
+        MessageEncode(message="0Bsd0000200", response_command="SD"),
+        priority_send=False,
+    )
+
+    # Garage was removed on the panel so is no longer configured or cached
+    rx_msg("SD", "00999                0", notifier)
+    assert zones[4].configured is False
+    assert zones[4].name == zones[4].default_name()
+    assert zones.descriptions() == {0: "Front door"}
+
+
+def test_unnamed_zone_in_use_keeps_status_updates(notifier):
+    zones = Zones(Mock(), notifier)
+    zones.load_descriptions({0: "Front door"})
+    rx_msg("ZD", f"1{'0' * 207}", notifier)
+    zones.auto_size()
+
+    # The name was removed on the panel but the zone is still defined
+    zones.get_descriptions(TextDescriptions.ZONE.value)
+    rx_msg("SD", "00999                0", notifier)
+    assert zones[0].configured is False
+    rx_msg("ZS", f"B{'0' * 207}", notifier)
+    assert zones[0].logical_status == ZoneLogicalStatus.VIOLATED
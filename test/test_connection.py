@@ -0,0 +1,149 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from elkm1_lib import ratelimit
+from elkm1_lib.connection import Connection
+from elkm1_lib.message import (
+    MessageEncode,
+    pc_encode,
+    pf_encode,
+    pn_encode,
+    pt_encode,
+)
+
+
+@pytest.fixture
+async def connection(notifier):
+    connection = Connection("elk://example.com", notifier)
+    connection._writer = Mock()
+    task = asyncio.create_task(connection._write_stream())
+    yield connection
+    task.cancel()
+
+
+async def drain(connection):
+    """Let pending callbacks run and the write loop empty the queue."""
+    for iteration in range(100):
+        await asyncio.sleep(0)
+        if not connection._write_queue and iteration >= 5:
+            break
+
+
+def written(connection):
+    return [
+        call.args[0].decode()[:-4] for call in connection._writer.write.call_args_list
+    ]
+
+
+async def test_batch_sends_together(connection):
+    connection.send(MessageEncode("06zs00", None))
+    async with connection.batch(priority=True, wait=True, timeout=1):
+        connection.send(MessageEncode("08ct001", None))
+        connection.send(MessageEncode("08ct001", None))
+        connection.send(pc_encode(0, 9, 20, 0))
+        connection.send(pf_encode(0))
+        assert connection._write_queue[0].msg == "06zs00"
+        assert len(connection._write_queue) == 1
+    assert written(connection)[:3] == ["08ct001", "08ct001", "09pfA0100"]
+    await drain(connection)
+    assert written(connection) == ["08ct001", "08ct001", "09pfA0100", "06zs00"]
+
+
+async def test_batch_only_collects_from_its_task(connection):
+    def other_task_send():
+        connection.send(MessageEncode("06zs00", None))
+        connection.send(MessageEncode("08as001", None), priority_send=True)
+
+    async with connection.batch():
+        connection.send(MessageEncode("08cn001", None))
+        connection.send(MessageEncode("08sd001", None), priority_send=True)
+        # e.g. a message handler or the poller, sending while the block waits
+        asyncio.get_running_loop().call_soon(other_task_send)
+        await drain(connection)
+        assert written(connection) == ["08as001", "06zs00"]
+    await drain(connection)
+    assert written(connection)[2:] == ["08sd001", "08cn001"]
+
+
+async def test_batch_discarded_on_error(connection):
+    with pytest.raises(RuntimeError):
+        async with connection.batch():
+            connection.send(MessageEncode("08cn001", None))
+            asyncio.get_running_loop().call_soon(
+                connection.send, MessageEncode("06zs00", None)
+            )
+            await asyncio.sleep(0)
+            raise RuntimeError
+    await drain(connection)
+    assert written(connection) == ["06zs00"]
+
+
+async def test_rate_limit_paces_writes(connection, monkeypatch):
+    now = [0.0]
+    paced = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        if delay:
+            paced.append((len(written(connection)), delay))
+            now[0] += delay
+        await real_sleep(0)
+
+    monkeypatch.setattr(ratelimit, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    connection.set_rate_limit(messages_per_second=50)
+    connection.set_rate_limit(messages_per_second=1000, priority=True)
+    for _ in range(52):
+        connection.send(MessageEncode("06zs00", None))
+    connection.send(MessageEncode("06as00", None), priority_send=True)
+    await drain(connection)
+    assert written(connection)[0] == "06as00"
+    assert len(written(connection)) == 53
+    # A full bucket sends 50 at once, then one every 1/50th of a second
+    assert paced == [(51, pytest.approx(0.02)), (52, pytest.approx(0.02))]
+
+    state = connection.rate_limit_state()
+    assert state["normal"]["delayed"] == 2
+    assert state["priority"]["delayed"] == 0
+    connection.set_rate_limit(priority=True)
+    assert list(connection.rate_limit_state()) == ["normal"]
+
+
+async def test_newer_keyed_write_replaces_queued_one(connection):
+    for level in (10, 20, 30):
+        connection.send(pc_encode(0, 9, level, 0))
+    connection.send(MessageEncode("06zs00", None))
+    connection.send(pf_encode(0))
+    connection.send(pc_encode(1, 9, 40, 0), priority_send=True)
+    connection.send(pc_encode(1, 9, 50, 0), priority_send=True)
+    await drain(connection)
+    assert written(connection) == ["11pcA020950000000", "06zs00", "09pfA0100"]
+
+
+async def test_keyed_write_stays_after_toggle_of_same_light(connection):
+    connection.send(pc_encode(0, 9, 50, 0))
+    connection.send(pt_encode(0))
+    connection.send(pf_encode(0))
+    connection.send(pc_encode(1, 9, 50, 0))
+    connection.send(pt_encode(1))
+    connection.send(pn_encode(1), priority_send=True)
+    await drain(connection)
+    assert written(connection) == [
+        "09pnA0200",
+        "09ptA0100",
+        "09pfA0100",
+        "11pcA020950000000",
+        "09ptA0200",
+    ]
+
+
+async def test_batch_supersedes_queued_write(connection):
+    connection.send(pc_encode(0, 9, 10, 0))
+    async with connection.batch(priority=True):
+        connection.send(pc_encode(0, 9, 20, 0))
+        connection.send(pc_encode(0, 9, 30, 0))
+    await drain(connection)
+    assert written(connection) == ["11pcA010930000000"]
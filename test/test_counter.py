@@ -0,0 +1,58 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from elkm1_lib.counters import Counters
+from elkm1_lib.message import MessageEncode
+
+from .util import rx_msg
+
+
+@pytest.fixture
+def counters(notifier):
+    return Counters(Mock(), notifier)
+
+
+def test_counter_value(counters, notifier):
+    rx_msg("CV", "0200042", notifier)
+    assert counters[1].value == 42
+
+
+async def test_counter_get_async_shares_request(counters, notifier):
+    first = asyncio.ensure_future(counters[1].get_async())
+    second = asyncio.ensure_future(counters[1].get_async())
+    await asyncio.sleep(0)
+    counters._connection.send.assert_called_once_with(MessageEncode("08cv0200", "CV"))
+
+    rx_msg("CV", "0200042", notifier)
+    assert await first == 42
+    assert await second == 42
+
+
+async def test_counter_get_async_uses_fresh_value(counters, notifier):
+    rx_msg("CV", "0200042", notifier)
+    assert await counters[1].get_async(max_age=60) == 42
+    counters._connection.send.assert_not_called()
+
+
+async def test_counter_get_async_timeout(counters):
+    with pytest.raises(TimeoutError):
+        await counters[1].get_async(timeout=0.01)
+    assert counters[1]._pending is None
+
+
+def test_counters_named_after_refresh_are_requested(counters, notifier):
+    send = counters._connection.send
+    counters.load_descriptions({0: "Pool"})
+    counters.sync_config()
+    counters.refresh()
+    rx_msg("SD", "10001Pool            0", notifier)
+    rx_msg("SD", "10002Garage          0", notifier)
+    rx_msg("SD", "10999                0", notifier)
+    values = [
+        call.args[0]
+        for call in send.call_args_list
+        if call.args[0].message[2:4] == "cv"
+    ]
+    assert values == [MessageEncode("08cv0100", "CV"), MessageEncode("08cv0200", "CV")]
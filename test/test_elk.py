@@ -0,0 +1,167 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from elkm1_lib.elk import Elk
+
+from .util import rx_msg
+
+UA_MSG = "000000000000000040F"
+
+
+@pytest.fixture
+async def elk():
+    with patch("elkm1_lib.elk.Connection"):
+        yield Elk({"url": "elk://1.2.3.4"})
+
+
+def sent_commands(elk):
+    return [call.args[0].message[2:4] for call in elk.connection.send.call_args_list]
+
+
+async def test_sync_requests_live_state_first(elk):
+    elk._call_sync_handlers()
+    commands = sent_commands(elk)
+    state_end = commands.index("ua")
+    assert set(commands[:state_end]) == {"vn", "ss", "az", "zs", "ps", "as", "ka", "cs"}
+    assert "sd" in commands[state_end:]
+    assert commands[-1] == "ua"
+
+
+async def test_sync_sends_state_ready_then_sync_complete(elk):
+    state_ready = Mock()
+    sync_complete = Mock()
+    elk.add_handler("state_ready", state_ready)
+    elk.add_handler("sync_complete", sync_complete)
+    elk._call_sync_handlers()
+
+    rx_msg("UA", UA_MSG, elk._notifier)
+    state_ready.assert_called_once()
+    sync_complete.assert_not_called()
+
+    rx_msg("UA", UA_MSG, elk._notifier)
+    sync_complete.assert_not_called()
+    rx_msg("UA", UA_MSG, elk._notifier)
+    sync_complete.assert_called_once()
+
+    rx_msg("UA", UA_MSG, elk._notifier)
+    state_ready.assert_called_once()
+    sync_complete.assert_called_once()
+
+
+async def test_sync_progress_and_report(elk):
+    progress = Mock()
+    elk.add_handler("sync_progress", progress)
+    elk._call_sync_handlers()
+    rx_msg("SD", "00001Front door      0", elk._notifier)
+    rx_msg("SD", "00999                0", elk._notifier)
+
+    statuses = [
+        (call.kwargs["element_type"], call.kwargs["status"])
+        for call in progress.call_args_list
+    ]
+    assert ("zones", "started") in statuses
+    assert ("zones", "description") in statuses
+    assert statuses[-1] == ("zones", "finished")
+    assert progress.call_args.kwargs["round_trips"] == 2
+
+    for _ in range(3):
+        rx_msg("UA", UA_MSG, elk._notifier)
+    report = elk.sync_report
+    assert report["descriptions"]["zones"]["round_trips"] == 2
+    assert report["sync_complete"] >= report["state_ready"] >= 0
+
+
+async def test_values_refreshed_before_sync_complete(elk):
+    sync_complete = Mock()
+    elk.add_handler("sync_complete", sync_complete)
+    elk._call_sync_handlers()
+    rx_msg("SD", "11001Living room     0", elk._notifier)
+    rx_msg("SD", "11999                0", elk._notifier)
+    rx_msg("SD", "10002Visitors        0", elk._notifier)
+    rx_msg("SD", "10999                0", elk._notifier)
+    assert "tr" not in sent_commands(elk)
+    assert "cv" not in sent_commands(elk)
+
+    rx_msg("UA", UA_MSG, elk._notifier)
+    elk.connection.send.reset_mock()
+    rx_msg("UA", UA_MSG, elk._notifier)
+    assert sent_commands(elk) == ["cv", "tr", "ua"]
+    sync_complete.assert_not_called()
+    rx_msg("UA", UA_MSG, elk._notifier)
+    sync_complete.assert_called_once()
+
+
+async def test_short_disconnect_resyncs_live_state_only():
+    with patch("elkm1_lib.elk.Connection"):
+        elk = Elk({"url": "elk://1.2.3.4", "resync_window": 60})
+    sync_complete = Mock()
+    elk.add_handler("sync_complete", sync_complete)
+
+    elk._connected()
+    assert "sd" in sent_commands(elk)
+    for _ in range(3):
+        rx_msg("UA", UA_MSG, elk._notifier)
+
+    elk._disconnected()
+    elk.connection.send.reset_mock()
+    elk._connected()
+    commands = sent_commands(elk)
+    assert "sd" not in commands
+    assert commands[-1] == "ua"
+    assert {"as", "zs", "cs", "ss"} <= set(commands)
+
+    rx_msg("UA", UA_MSG, elk._notifier)
+    assert sync_complete.call_count == 2
+    assert elk.sync_report["full"] is False
+
+
+async def test_reconnect_without_resync_window_is_full_sync(elk):
+    elk._connected()
+    rx_msg("UA", UA_MSG, elk._notifier)
+    rx_msg("UA", UA_MSG, elk._notifier)
+    elk._disconnected()
+    elk.connection.send.reset_mock()
+    elk._connected()
+    assert "sd" in sent_commands(elk)
+
+
+async def test_rate_limit_config():
+    with patch("elkm1_lib.elk.Connection"):
+        elk = Elk(
+            {
+                "url": "elk://1.2.3.4",
+                "rate_limit": {"normal": (20, None), "priority": (None, 960)},
+            }
+        )
+        assert elk.connection.set_rate_limit.call_args_list == [
+            ((20, None), {"priority": False}),
+            ((None, 960), {"priority": True}),
+        ]
+        with pytest.raises(ValueError):
+            Elk({"url": "elk://1.2.3.4", "rate_limit": {"urgent": (1, 1)}})
+
+
+async def test_event_log_config(tmp_path):
+    with patch("elkm1_lib.elk.Connection"):
+        elk = Elk({"url": "elk://1.2.3.4", "event_log": str(tmp_path / "log.db")})
+    rx_msg("LD", "1173005114300615008325", elk._notifier)
+    events = await elk.event_log.query()
+    assert [(event["area"], event["event"]) for event in events] == [(0, 1173)]
+    assert elk.areas[0].last_log["user_number"] == 5
+    await elk.event_log.close()
+
+
+async def test_description_cache_saves_one_at_a_time(tmp_path):
+    with patch("elkm1_lib.elk.Connection"):
+        elk = Elk({"url": "elk://1.2.3.4", "description_cache": str(tmp_path / "c")})
+    elk.panel.elkm1_version = "5.3.10"
+    with patch.object(elk._description_cache, "save") as save:
+        elk._save_description_cache()
+        elk._save_description_cache()
+        elk._save_description_cache()
+        while elk._cache_saving:
+            await asyncio.gather(elk._cache_saving, asyncio.sleep(0))
+    # The two saves asked for while the first was written become one
+    assert save.call_count == 2
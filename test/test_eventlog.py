@@ -0,0 +1,39 @@
+import datetime as dt
+
+from elkm1_lib.eventlog import EventLog
+from elkm1_lib.notify import Notifier
+
+from .util import rx_msg
+
+
+def ld(area, event, hour):
+    return f"{event:04}005{area + 1}{hour:02}300615{hour:03}325"
+
+
+async def test_event_log_batches_and_queries(tmp_path):
+    notifier = Notifier()
+    event_log = EventLog(str(tmp_path / "events.db"), flush_interval=60, batch_size=3)
+    notifier.attach("LD", event_log.add)
+
+    rx_msg("LD", ld(0, 1173, 8), notifier)
+    rx_msg("LD", ld(1, 1174, 9), notifier)
+    assert len(event_log._pending) == 2
+    rx_msg("LD", ld(0, 1174, 10), notifier)
+    assert not event_log._pending
+    rx_msg("LD", ld(0, 1173, 11), notifier)
+
+    events = await event_log.query(area=0)
+    assert [event["event"] for event in events] == [1173, 1174, 1173]
+    assert events[0]["number"] == 5
+    assert events[0]["index"] == 8
+
+    start = dt.datetime.fromisoformat(events[1]["timestamp"])
+    events = await event_log.query(event=1174, start=start)
+    assert [(event["area"], event["index"]) for event in events] == [(0, 10)]
+    assert len(await event_log.query(limit=2)) == 2
+    await event_log.close()
+
+    # Events persist across instances
+    event_log = EventLog(str(tmp_path / "events.db"))
+    assert len(await event_log.query()) == 4
+    await event_log.close()
@@ -0,0 +1,37 @@
+import pytest
+
+from elkm1_lib.history import History
+
+
+def test_history_wraps_and_queries():
+    history = History(3)
+    history.record({"output_on": True}, 1.0)
+    history.record({"output_on": False, "name": "Siren"}, 2.0)
+    history.record({"output_on": True}, 3.0)
+    history.record({"output_on": False}, 4.0)
+
+    assert len(history) == 3
+    assert list(history) == [
+        (2.0, "name", "Siren"),
+        (3.0, "output_on", True),
+        (4.0, "output_on", False),
+    ]
+    assert history.last("output_on", True) == (3.0, "output_on", True)
+    assert history.last("output_on") == (4.0, "output_on", False)
+    assert history.last("unknown") is None
+    assert history.count("output_on") == 2
+    assert history.count("output_on", since=3.5) == 1
+    assert list(history.entries("output_on", since=3.5)) == [(4.0, "output_on", False)]
+
+
+def test_history_records_only_watched_attrs():
+    history = History(5, ["logical_status"])
+    history.record({"logical_status": 2, "voltage": 12.1}, 1.0)
+    assert list(history) == [(1.0, "logical_status", 2)]
+    history.clear()
+    assert not list(history)
+
+
+def test_history_size_must_be_positive():
+    with pytest.raises(ValueError):
+        History(0)
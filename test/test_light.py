@@ -0,0 +1,69 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from elkm1_lib.const import TextDescriptions
+from elkm1_lib.lights import Lights
+from elkm1_lib.message import MessageEncode
+
+from .util import rx_msg
+
+
+@pytest.fixture
+def lights(notifier):
+    return Lights(Mock(), notifier)
+
+
+def test_light_status_bank(lights, notifier):
+    rx_msg("PS", "1" + "0" * 3 + "5" + "0" * 60, notifier)
+    assert lights[67].status == 5
+    assert [light.index for light in lights._materialized()] == [67]
+
+
+def test_light_sync_only_banks_with_named_lights(lights, notifier):
+    lights.sync_state()
+    assert lights._connection.send.call_count == 4
+
+    lights.get_descriptions(TextDescriptions.LIGHT.value)
+    rx_msg("SD", "07003Kitchen         0", notifier)
+    rx_msg("SD", "07999                0", notifier)
+
+    lights._connection.send.reset_mock()
+    lights.sync_state()
+    lights._connection.send.assert_called_once_with(MessageEncode("07ps000", "PS"))
+
+    # Only named lights are updated from the bank status
+    rx_msg("PS", "0" + "7" * 64, notifier)
+    assert lights[2].status == 7
+    assert [light.index for light in lights._materialized()] == [2]
+
+
+async def test_apply_scene_skips_lights_already_at_level(lights, notifier):
+    rx_msg("PS", "0" + "0" * 63 + "7", notifier)
+    lights[2].status = 50
+    done = lights.apply_scene({0: 0, 1: 100, 2: 50, 63: 0})
+
+    assert lights._connection.send.call_count == 2
+    rx_msg("PC", "A0201", notifier)
+    assert not done.done()
+    rx_msg("PC", "D1600", notifier)
+    assert await done is True
+
+
+async def test_apply_scene_times_out(lights):
+    done = lights.apply_scene({0: 40, 1: 60}, timeout=0.01)
+    assert lights._connection.send.call_count == 2
+    assert await done is False
+
+
+async def test_apply_scene_waits_for_reported_level(lights, notifier):
+    rx_msg("PC", "A0101", notifier)
+    done = lights.apply_scene({0: 100, 3: 40})
+    lights._connection.send.assert_called_once()
+
+    rx_msg("PC", "A0420", notifier)
+    await asyncio.sleep(0)
+    assert not done.done()
+    rx_msg("PC", "A0440", notifier)
+    assert await done is True
@@ -205,3 +205,24 @@ def test_zv_encode():
 
 def test_ua_encode():
     assert m.ua_encode(654321) == ("0Cua65432100", "UA")
+
+
+def test_replace_key():
+    heat = m.ts_encode(1, 68, ThermostatSetting.HEAT_SETPOINT).message
+    assert m.replace_key(heat) == m.replace_key(
+        m.ts_encode(1, 70, ThermostatSetting.HEAT_SETPOINT).message
+    )
+    assert m.replace_key(heat) != m.replace_key(
+        m.ts_encode(1, 70, ThermostatSetting.COOL_SETPOINT).message
+    )
+    assert m.replace_key(m.cx_encode(3, 10).message) == "cx04"
+    assert m.replace_key(m.pc_encode(5, 9, 50, 0).message) == m.replace_key(
+        m.pf_encode(5).message
+    )
+    assert m.replace_key(m.pt_encode(5).message) is None
+    assert m.replace_key(m.zs_encode().message) is None
+
+
+def test_toggle_key():
+    assert m.toggle_key(m.pt_encode(5).message) == m.replace_key(m.pf_encode(5).message)
+    assert m.toggle_key(m.pf_encode(5).message) is None
@@ -0,0 +1,31 @@
+from unittest.mock import Mock
+
+import pytest
+
+from elkm1_lib.message import MessageEncode
+from elkm1_lib.outputs import Outputs
+
+from .util import rx_msg
+
+
+@pytest.fixture
+def outputs(notifier):
+    return Outputs(Mock(), notifier)
+
+
+async def test_set_many_skips_outputs_already_set(outputs, notifier):
+    outputs[1].output_on = True
+    confirmations = outputs.set_many({0: True, 1: True, 2: False, 3: False})
+
+    outputs._connection.send.assert_called_once_with(
+        MessageEncode("0Ecn0010000000", None)
+    )
+    assert list(confirmations) == [0]
+    rx_msg("CC", "0011", notifier)
+    assert await confirmations[0] is True
+
+
+async def test_set_many_times_out(outputs):
+    outputs[4].output_on = True
+    confirmations = outputs.set_many({4: False}, timeout=0.01)
+    assert await confirmations[4] is False
@@ -0,0 +1,65 @@
+import asyncio
+from unittest.mock import Mock
+
+from elkm1_lib.poller import Poller
+
+
+def poller_for(notifier, connection, polls):
+    return Poller(connection, notifier, polls, 0.05, 0.2)
+
+
+async def test_poller_backs_off_when_quiet(notifier, monkeypatch):
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    connection = Mock()
+    connection.is_idle.return_value = True
+    connection.is_paused.return_value = False
+    poll = Mock()
+    poller = poller_for(notifier, connection, [poll])
+
+    notifier.notify("connected", {})
+    while len(delays) < 4:
+        await real_sleep(0)
+    assert delays == [0.05, 0.1, 0.2, 0.2]
+    assert poll.call_count == 3
+    assert poller.interval == 0.2
+
+    notifier.notify("timeout", {"msg_code": "ZS"})
+    assert poller.interval == 0.05
+    notifier.notify("disconnected", {})
+    poll.reset_mock()
+    for _ in range(5):
+        await real_sleep(0)
+    poll.assert_not_called()
+
+
+async def test_poller_skips_when_paused(notifier, monkeypatch):
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    connection = Mock()
+    connection.is_idle.return_value = True
+    connection.is_paused.return_value = True
+    poll = Mock()
+    poller = poller_for(notifier, connection, [poll])
+
+    notifier.notify("connected", {})
+    while len(delays) < 3:
+        await real_sleep(0)
+    # Each interval passes without a poll or back off while paused
+    assert delays == [0.05, 0.05, 0.05]
+    assert connection.is_paused.call_count == 2
+    poll.assert_not_called()
+    assert poller.interval == 0.05
+    notifier.notify("disconnected", {})
@@ -0,0 +1,44 @@
+import pytest
+
+from elkm1_lib import ratelimit
+from elkm1_lib.ratelimit import RateLimiter, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_token_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(10)
+    for _ in range(10):
+        assert bucket.delay(1) == 0
+        bucket.consume(1)
+    assert bucket.delay(1) == pytest.approx(0.1)
+    clock[0] += 5
+    assert bucket.tokens == 10
+
+
+def test_token_bucket_allows_large_cost_when_full(clock):
+    bucket = TokenBucket(4)
+    assert bucket.delay(10) == 0
+    bucket.consume(10)
+    assert bucket.delay(1) == pytest.approx(1.75)
+
+
+def test_token_bucket_rejects_bad_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_rate_limiter_uses_slowest_budget(clock):
+    limiter = RateLimiter(messages_per_second=100, bytes_per_second=20)
+    limiter.consume(20)
+    assert limiter.delay(10) == pytest.approx(0.5)
+    limiter.consume(10, delayed=0.5)
+    state = limiter.state()
+    assert state["message_tokens"] == 98
+    assert state["byte_tokens"] == -10
+    assert (state["delayed"], state["delay_time"]) == (1, 0.5)
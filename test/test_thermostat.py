@@ -58,3 +58,22 @@ def test_thermostat_set_sends_correct_command_to_elk():
     mock.send.assert_called_with(
         MessageEncode(message="0Bts0142500", response_command=None)
     )
+
+
+def test_thermostats_refresh_configured(notifier):
+    connection = Mock()
+    thermostats = Thermostats(connection, notifier)
+    thermostats.sync()
+    rx_msg("SD", "11001Living room     0", notifier)
+    rx_msg("SD", "11003Basement        0", notifier)
+    rx_msg("SD", "11999                0", notifier)
+    assert MessageEncode("08tr0100", None) not in [
+        call.args[0] for call in connection.send.call_args_list
+    ]
+
+    connection.send.reset_mock()
+    thermostats.refresh()
+    assert [call.args for call in connection.send.call_args_list] == [
+        (MessageEncode("08tr0100", None),),
+        (MessageEncode("08tr0300", None),),
+    ]
@@ -1,8 +1,15 @@
+import asyncio
 from unittest.mock import Mock
 
 import pytest
 
-from elkm1_lib.const import ZoneLogicalStatus, ZonePhysicalStatus, ZoneType
+from elkm1_lib.const import (
+    Overflow,
+    TextDescriptions,
+    ZoneLogicalStatus,
+    ZonePhysicalStatus,
+    ZoneType,
+)
 from elkm1_lib.zones import Zones
 
 from .util import rx_msg
@@ -44,3 +51,270 @@ def test_zone_alarm_state(zones, notifier):
 def test_zone_voltage(zones, notifier):
     rx_msg("ZV", "123072", notifier)
     assert zones[122].voltage == pytest.approx(7.2)
+
+
+def test_zone_status_bulk_update_notifies_changed_zones_only(zones, notifier):
+    callback = Mock()
+    zones[0].add_callback(callback)
+    zones[1].add_callback(callback)
+    rx_msg("ZS", f"B0{'0' * 206}", notifier)
+    callback.assert_called_once_with(
+        zones[0],
+        {
+            "logical_status": ZoneLogicalStatus.VIOLATED,
+            "physical_status": ZonePhysicalStatus.SHORT,
+        },
+    )
+
+
+def test_zone_select_and_column(zones, notifier):
+    rx_msg("ZS", f"B02{'0' * 205}", notifier)
+    violated = zones.select(logical_status=ZoneLogicalStatus.VIOLATED)
+    assert [zone.index for zone in violated] == [0]
+    assert zones.select(physical_status=ZonePhysicalStatus.EOL)[0].index == 2
+    column = zones.column("physical_status")
+    assert len(column) == 208
+    assert column[:3] == [
+        ZonePhysicalStatus.SHORT,
+        ZonePhysicalStatus.UNCONFIGURED,
+        ZonePhysicalStatus.EOL,
+    ]
+
+
+def test_zone_select_initial_values(zones, notifier):
+    rx_msg("ZC", "001B", notifier)
+    rx_msg("ZC", "0032", notifier)
+    indexes = zones.select_indexes(logical_status=ZoneLogicalStatus.NORMAL)
+    assert indexes == list(range(1, 208))
+    assert len(list(zones._materialized())) == 2
+    zones.limit(16)
+    assert zones.select_indexes(definition=ZoneType.DISABLED) == list(range(16))
+    normal = zones.select(logical_status=ZoneLogicalStatus.NORMAL)
+    assert [zone.index for zone in normal] == list(range(1, 16))
+    assert zones.select(
+        logical_status=ZoneLogicalStatus.NORMAL,
+        physical_status=ZonePhysicalStatus.EOL,
+    ) == [zones[2]]
+
+
+def test_zones_callback_batches_bulk_report(zones, notifier):
+    callback = Mock()
+    zones.add_callback(callback)
+    rx_msg("ZS", f"B02{'0' * 205}", notifier)
+    callback.assert_called_once_with(
+        zones,
+        {
+            0: {
+                "logical_status": ZoneLogicalStatus.VIOLATED,
+                "physical_status": ZonePhysicalStatus.SHORT,
+            },
+            2: {"physical_status": ZonePhysicalStatus.EOL},
+        },
+    )
+
+
+def test_zones_callback_for_single_zone_change(zones, notifier):
+    callback = Mock()
+    zones.add_callback(callback)
+    rx_msg("ZC", "001B", notifier)
+    callback.assert_called_once_with(
+        zones,
+        {
+            0: {
+                "logical_status": ZoneLogicalStatus.VIOLATED,
+                "physical_status": ZonePhysicalStatus.SHORT,
+            }
+        },
+    )
+    zones.remove_callback(callback)
+    rx_msg("ZC", "0019", notifier)
+    callback.assert_called_once()
+
+
+def test_zone_callback_filtered_by_attribute(zones, notifier):
+    status_callback = Mock()
+    voltage_callback = Mock()
+    zones[0].add_callback(status_callback, ["logical_status"])
+    zones[0].add_callback(voltage_callback, ["voltage"])
+
+    rx_msg("ZV", "001072", notifier)
+    status_callback.assert_not_called()
+    voltage_callback.assert_called_once()
+
+    rx_msg("ZC", "001B", notifier)
+    status_callback.assert_called_once_with(
+        zones[0],
+        {
+            "logical_status": ZoneLogicalStatus.VIOLATED,
+            "physical_status": ZonePhysicalStatus.SHORT,
+        },
+    )
+    voltage_callback.assert_called_once()
+
+
+def test_zones_created_only_when_used(zones, notifier):
+    assert list(zones._materialized()) == []
+    rx_msg("ZS", f"B0{'0' * 206}", notifier)
+    assert [zone.index for zone in zones._materialized()] == [0]
+    assert zones[5].physical_status == ZonePhysicalStatus.UNCONFIGURED
+    assert [zone.index for zone in zones._materialized()] == [0, 5]
+    assert [zone.index for zone in zones[4:7]] == [4, 5, 6]
+    assert [zone.index for zone in zones[-2:]] == [206, 207]
+    assert len(list(zones)) == 208
+
+
+def test_zones_indexes_follow_changes(zones, notifier):
+    rx_msg("ZP", f"12{'1' * 206}", notifier)
+    rx_msg("ZS", f"BB{'0' * 206}", notifier)
+    assert zones._indexes["area"][1] == {1}
+    selected = zones.select(area=1, logical_status=ZoneLogicalStatus.VIOLATED)
+    assert [zone.index for zone in selected] == [1]
+
+    rx_msg("ZC", "0021", notifier)
+    assert zones.select(area=1, logical_status=ZoneLogicalStatus.VIOLATED) == []
+    assert [zone.index for zone in zones.select(area=1)] == [1]
+    assert ZoneLogicalStatus.VIOLATED in zones._indexes["logical_status"]
+    assert zones._indexes["logical_status"][ZoneLogicalStatus.VIOLATED] == {0}
+
+
+def test_zones_limited_to_first_zones(zones, notifier):
+    zones.limit(4)
+    rx_msg("ZS", "BBBBBBBB" + "0" * 200, notifier)
+    assert [zone.index for zone in zones._materialized()] == [0, 1, 2, 3]
+    assert len(zones.column("logical_status")) == 4
+    rx_msg("ZC", "010B", notifier)
+    with pytest.raises(IndexError):
+        zones[9]
+
+    zones.get_descriptions(TextDescriptions.ZONE.value)
+    zones._connection.send.reset_mock()
+    rx_msg("SD", "00005Back door       0", notifier)
+    zones._connection.send.assert_not_called()
+
+
+def test_zones_auto_size_only_updates_active_zones(zones, notifier):
+    rx_msg("ZD", f"1100{'0' * 204}", notifier)
+    zones.auto_size()
+    assert zones._active == [0, 1]
+
+    rx_msg("ZS", "BBBB" + "0" * 204, notifier)
+    assert [zone.index for zone in zones._materialized()] == [0, 1]
+    assert zones[1].logical_status == ZoneLogicalStatus.VIOLATED
+
+    # Zone that becomes enabled is added to the active zones
+    rx_msg("ZD", f"1110{'0' * 204}", notifier)
+    assert zones._active == [0, 1, 2]
+
+
+async def test_zone_events_drop_oldest(zones, notifier):
+    events = zones.events(maxsize=2)
+    first = asyncio.ensure_future(anext(events))
+    await asyncio.sleep(0)
+    rx_msg("ZC", "001B", notifier)
+    assert await first == (
+        0,
+        {
+            "logical_status": ZoneLogicalStatus.VIOLATED,
+            "physical_status": ZonePhysicalStatus.SHORT,
+        },
+    )
+
+    for zone in ("002B", "003B", "004B"):
+        rx_msg("ZC", zone, notifier)
+    assert [(await anext(events))[0] for _ in range(2)] == [2, 3]
+    await events.aclose()
+    assert not zones._observers
+
+
+async def test_zone_events_coalesce(zones, notifier):
+    events = zones.events(overflow=Overflow.COALESCE)
+    first = asyncio.ensure_future(anext(events))
+    await asyncio.sleep(0)
+    rx_msg("ZC", "0029", notifier)
+    rx_msg("ZC", "003B", notifier)
+    rx_msg("ZC", "002B", notifier)
+    assert await first == (
+        1,
+        {
+            "logical_status": ZoneLogicalStatus.VIOLATED,
+            "physical_status": ZonePhysicalStatus.SHORT,
+        },
+    )
+    assert (await anext(events))[0] == 2
+    await events.aclose()
+
+
+async def test_zone_events_coalesce_never_drops(zones, notifier):
+    events = zones.events(maxsize=2, overflow=Overflow.COALESCE)
+    first = asyncio.ensure_future(anext(events))
+    await asyncio.sleep(0)
+    rx_msg("ZS", f"{'B' * 5}{'0' * 203}", notifier)
+    rx_msg("ZC", "0019", notifier)
+    async with asyncio.timeout(1):
+        indexes = [(await first)[0]] + [(await anext(events))[0] for _ in range(4)]
+    assert indexes == [0, 1, 2, 3, 4]
+    await events.aclose()
+
+
+async def test_zone_debounce_merges_flips(zones, notifier, monkeypatch):
+    timers = []
+    monkeypatch.setattr(
+        asyncio.get_running_loop(),
+        "call_later",
+        lambda delay, callback, *args: timers.append((delay, callback, args)),
+    )
+    zones.set_debounce(0.02)
+    zones[0].definition = ZoneType.BURGLAR_ENTRY_EXIT_1
+    callback = Mock()
+    zones[0].add_callback(callback)
+    for status in ("0019", "0012", "0019"):
+        rx_msg("ZC", status, notifier)
+    callback.assert_not_called()
+
+    [(delay, expired, args)] = timers
+    assert delay == 0.02
+    expired(*args)
+    callback.assert_called_once_with(
+        zones[0],
+        {
+            "logical_status": ZoneLogicalStatus.VIOLATED,
+            "physical_status": ZonePhysicalStatus.OPEN,
+            "flip_count": 3,
+        },
+    )
+
+
+async def test_zone_debounce_skips_critical_types(zones, notifier):
+    zones.set_debounce(10)
+    # Until ZD reports definitions zones are not held back
+    rx_msg("ZC", "0039", notifier)
+    assert zones[2].logical_status == ZoneLogicalStatus.VIOLATED
+    zones[1].definition = ZoneType.FIRE_ALARM
+    rx_msg("ZC", "0029", notifier)
+    assert zones[1].logical_status == ZoneLogicalStatus.VIOLATED
+
+    zones.set_debounce(10, zone_types=[ZoneType.FIRE_ALARM])
+    rx_msg("ZC", "0022", notifier)
+    assert zones[1].logical_status == ZoneLogicalStatus.VIOLATED
+
+    # A zone status report applies held back changes first
+    rx_msg("ZS", "9" + "0" * 207, notifier)
+    assert zones[1].flip_count == 1
+    assert zones[0].logical_status == ZoneLogicalStatus.VIOLATED
+    assert not zones._debounced
+
+
+def test_zone_history(zones, notifier):
+    zones.enable_history(10, ["physical_status"])
+    rx_msg("ZC", "0019", notifier)
+    rx_msg("ZC", "0012", notifier)
+    rx_msg("ZS", "1" + "0" * 207, notifier)
+
+    history = zones[0].history
+    assert [value for _, _, value in history] == [
+        ZonePhysicalStatus.OPEN,
+        ZonePhysicalStatus.EOL,
+        ZonePhysicalStatus.OPEN,
+    ]
+    assert history.count("physical_status", ZonePhysicalStatus.OPEN) == 2
+    assert len(zones[1].history) == 0